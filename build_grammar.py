@@ -0,0 +1,23 @@
+import argparse
+from pathlib import Path
+from tatsu import to_python_sourcecode
+from parser_tatsu import grammar_digest
+
+GRAMMAR_FILE = Path(__file__).resolve().parent / 'grammar.ebnf'
+PARSER_FILE = Path(__file__).resolve().parent / 'dbc_grammar.py'
+
+def build_grammar(grammar_file: Path = GRAMMAR_FILE, parser_file: Path = PARSER_FILE) -> Path:
+    if not grammar_file.exists():
+        raise RuntimeError(f"Wrong grammar file {grammar_file}")
+    grammar = grammar_file.read_text()
+    source = to_python_sourcecode(grammar, filename=grammar_file.name)
+    # Lets parser_tatsu detect a generated parser that is older than the grammar
+    source += f"\nGRAMMAR_DIGEST = '{grammar_digest(grammar)}'\n"
+    parser_file.write_text(source)
+    return parser_file
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Generate the DBC parser module from the EBNF grammar')
+    parser.add_argument('-o', '--output', default=str(PARSER_FILE), help='Output python module')
+    args = parser.parse_args()
+    build_grammar(GRAMMAR_FILE, Path(args.output))
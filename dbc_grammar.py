@@ -0,0 +1,1082 @@
+#!/usr/bin/env python3
+
+# WARNING: CAVEAT UTILITOR
+#
+#  This file was automatically generated by TatSu.
+#
+#     https://pypi.python.org/pypi/tatsu/
+#
+#  Any changes you make to it will be overwritten the next time
+#  the file is generated.
+
+# ruff: noqa: C405, COM812, I001, F401, PLR1702, PLC2801, SIM117
+
+import sys
+from pathlib import Path
+
+from tatsu.buffering import Buffer
+from tatsu.parsing import Parser
+from tatsu.parsing import tatsumasu
+from tatsu.parsing import leftrec, nomemo, isname
+from tatsu.parserconfig import ParserConfig
+from tatsu.util import re, generic_main
+
+
+KEYWORDS: set[str] = set()
+
+
+class DBCBuffer(Buffer):
+    def __init__(self, text, /, config: ParserConfig | None = None, **settings):
+        config = ParserConfig.new(
+            config,
+            whitespace=None,
+            nameguard=None,
+            ignorecase=False,
+            namechars='',
+            parseinfo=False,
+            comments=None,
+            eol_comments=None,
+            keywords=KEYWORDS,
+            start='dbc_file',
+        )
+        config = config.replace(**settings)
+
+        super().__init__(text, config=config)
+
+
+class DBCParser(Parser):
+    def __init__(self, /, config: ParserConfig | None = None, **settings):
+        config = ParserConfig.new(
+            config,
+            whitespace=None,
+            nameguard=None,
+            ignorecase=False,
+            namechars='',
+            parseinfo=False,
+            comments=None,
+            eol_comments=None,
+            keywords=KEYWORDS,
+            start='dbc_file',
+        )
+        config = config.replace(**settings)
+
+        super().__init__(config=config)
+
+    @tatsumasu()
+    def _dbc_file_(self):
+        self._version_()
+        self.name_last_node('version')
+        self._new_symbols_()
+        self._bit_timing_()
+        self._nodes_()
+        self.name_last_node('nodes')
+        self._value_tables_()
+        self.name_last_node('value_tables')
+        self._messages_()
+        self.name_last_node('messages')
+        self._message_transmitters_()
+        self._environment_variables_()
+        self.name_last_node('environment_variables')
+        self._environment_variables_data_()
+        self.name_last_node('environment_variables_data')
+        self._signal_types_()
+        self.name_last_node('signal_types')
+        self._comments_()
+        self.name_last_node('comments')
+        self._attribute_definitions_()
+        self.name_last_node('attribute_definitions')
+        self._attribute_defaults_()
+        self.name_last_node('attribute_defaults')
+        self._attribute_values_()
+        self.name_last_node('attribute_values')
+        self._value_descriptions_()
+        self.name_last_node('value_descriptions')
+        self._signal_type_refs_()
+        self.name_last_node('signal_type_refs')
+        self._signal_groups_()
+        self.name_last_node('signal_groups')
+        self._check_eof()
+        self._define(['attribute_defaults', 'attribute_definitions', 'attribute_values', 'comments', 'environment_variables', 'environment_variables_data', 'messages', 'nodes', 'signal_groups', 'signal_type_refs', 'signal_types', 'value_descriptions', 'value_tables', 'version'], [])
+
+    @tatsumasu()
+    def _version_(self):
+        with self._optional():
+            self._token('VERSION')
+            self._CANdb_version_string_()
+
+    @tatsumasu()
+    def _CANdb_version_string_(self):
+        self._char_string_()
+
+    @tatsumasu()
+    def _new_symbols_(self):
+        with self._optional():
+            self._token('NS_')
+            self._token(':')
+            with self._optional():
+                self._token('NS_DESC_')
+            with self._optional():
+                self._token('CM_')
+            with self._optional():
+                self._token('BA_DEF_')
+            with self._optional():
+                self._token('BA_')
+            with self._optional():
+                self._token('VAL_')
+            with self._optional():
+                self._token('CAT_DEF_')
+            with self._optional():
+                self._token('CAT_')
+            with self._optional():
+                self._token('FILTER')
+            with self._optional():
+                self._token('BA_DEF_DEF_')
+            with self._optional():
+                with self._choice():
+                    with self._option():
+                        self._token('EV_DATA_')
+                    with self._option():
+                        self._token('EV_DATA')
+                    self._error(
+                        'expecting one of: '
+                        "'EV_DATA' 'EV_DATA_'"
+                    )
+            with self._optional():
+                self._token('ENVVAR_DATA_')
+            with self._optional():
+                self._token('SGTYPE_')
+            with self._optional():
+                self._token('SGTYPE_VAL_')
+            with self._optional():
+                self._token('BA_DEF_SGTYPE_')
+            with self._optional():
+                self._token('BA_SGTYPE_')
+            with self._optional():
+                self._token('SIG_TYPE_REF_')
+            with self._optional():
+                self._token('VAL_TABLE_')
+            with self._optional():
+                self._token('SIG_GROUP_')
+            with self._optional():
+                self._token('SIG_VALTYPE_')
+            with self._optional():
+                self._token('SIGTYPE_VALTYPE_')
+            with self._optional():
+                self._token('BO_TX_BU_')
+            with self._optional():
+                self._token('BA_DEF_REL_')
+            with self._optional():
+                self._token('BA_REL_')
+            with self._optional():
+                self._token('BA_DEF_DEF_REL_')
+            with self._optional():
+                self._token('BU_SG_REL_')
+            with self._optional():
+                self._token('BU_EV_REL_')
+            with self._optional():
+                self._token('BU_BO_REL_')
+            with self._optional():
+                self._token('SG_MUL_VAL_')
+
+    @tatsumasu()
+    def _bit_timing_(self):
+        self._token('BS_:')
+        with self._optional():
+            self._baudrate_()
+            self._token(':')
+            self._BTR1_()
+            self._token(',')
+            self._BTR2_()
+
+    @tatsumasu()
+    def _baudrate_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _BTR1_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _BTR2_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _nodes_(self):
+        self._token('BU_:')
+
+        def block0():
+            self._node_name_()
+        self._closure(block0)
+        self.name_last_node('node_names')
+        self._define(['node_names'], [])
+
+    @tatsumasu()
+    def _node_name_(self):
+        self._C_identifier_()
+
+    @tatsumasu()
+    def _value_tables_(self):
+
+        def block0():
+            self._value_table_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _value_table_(self):
+        self._token('VAL_TABLE_')
+        self._value_table_name_()
+
+        def block0():
+            self._value_description_()
+        self._closure(block0)
+        self._token(';')
+
+    @tatsumasu()
+    def _messages_(self):
+
+        def block0():
+            self._message_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _message_(self):
+        self._token('BO_')
+        self._message_id_()
+        self.name_last_node('message_id')
+        self._message_name_()
+        self.name_last_node('message_name')
+        self._token(':')
+        self._message_size_()
+        self.name_last_node('message_size')
+        self._transmitter_()
+        self.name_last_node('transmitter')
+
+        def block0():
+            self._signal_()
+        self._closure(block0)
+        self.name_last_node('signals')
+        self._define(['message_id', 'message_name', 'message_size', 'signals', 'transmitter'], [])
+
+    @tatsumasu()
+    def _signal_(self):
+        self._token('SG_')
+        self._signal_name_()
+        self.name_last_node('signal_name')
+        self._multiplexer_indicator_()
+        self._token(':')
+        self._start_bit_()
+        self.name_last_node('start_bit')
+        self._token('|')
+        self._signal_size_()
+        self.name_last_node('signal_size')
+        self._token('@')
+        self._byte_order_()
+        self.name_last_node('byte_order')
+        self._value_type_()
+        self.name_last_node('value_type')
+        self._token('(')
+        self._factor_()
+        self.name_last_node('factor')
+        self._token(',')
+        self._offset_()
+        self.name_last_node('offset')
+        self._token(')')
+        self._token('[')
+        self._minimum_()
+        self.name_last_node('minimum')
+        self._token('|')
+        self._maximum_()
+        self.name_last_node('maximum')
+        self._token(']')
+        self._unit_()
+        self.name_last_node('unit')
+        self._receiver_list_()
+        self.name_last_node('receivers')
+        self._define(['byte_order', 'factor', 'maximum', 'minimum', 'offset', 'receivers', 'signal_name', 'signal_size', 'start_bit', 'unit', 'value_type'], [])
+
+    @tatsumasu()
+    def _receiver_list_(self):
+        self._receiver_()
+        self.add_last_node_to_name('@')
+
+        def block0():
+            self._token(',')
+            self._receiver_()
+            self.add_last_node_to_name('@')
+        self._closure(block0)
+
+    @tatsumasu()
+    def _multiplexer_indicator_(self):
+        with self._optional():
+            with self._choice():
+                with self._option():
+                    self._token('M')
+                with self._option():
+                    with self._group():
+                        self._token('m')
+                        self._multiplexer_switch_value_()
+                self._error(
+                    'expecting one of: '
+                    "'M' 'm'"
+                )
+
+    @tatsumasu()
+    def _multiplexer_switch_value_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _message_size_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _transmitter_(self):
+        with self._choice():
+            with self._option():
+                self._node_name_()
+            with self._option():
+                self._token('Vector__XXX')
+            self._error(
+                'expecting one of: '
+                "'Vector__XXX' (?!(?:BU_|BO_|SG_|EV_|VAL_"
+                'TABLE_|CM_|BA_DEF_))[_a-zA-Z][-_a-'
+                'zA-Z0-9]* <C_identifier> <node_name>'
+            )
+
+    @tatsumasu()
+    def _start_bit_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _signal_size_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _byte_order_(self):
+        with self._choice():
+            with self._option():
+                self._token('0')
+            with self._option():
+                self._token('1')
+            self._error(
+                'expecting one of: '
+                "'0' '1'"
+            )
+
+    @tatsumasu()
+    def _value_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('+')
+            with self._option():
+                self._token('-')
+            self._error(
+                'expecting one of: '
+                "'+' '-'"
+            )
+
+    @tatsumasu()
+    def _factor_(self):
+        self._double_()
+
+    @tatsumasu()
+    def _offset_(self):
+        self._double_()
+
+    @tatsumasu()
+    def _unit_(self):
+        self._char_string_()
+
+    @tatsumasu()
+    def _receiver_(self):
+        with self._choice():
+            with self._option():
+                self._node_name_()
+            with self._option():
+                self._token('Vector__XXX')
+            self._error(
+                'expecting one of: '
+                "'Vector__XXX' (?!(?:BU_|BO_|SG_|EV_|VAL_"
+                'TABLE_|CM_|BA_DEF_))[_a-zA-Z][-_a-'
+                'zA-Z0-9]* <C_identifier> <node_name>'
+            )
+
+    @tatsumasu()
+    def _message_transmitters_(self):
+
+        def block0():
+            self._message_transmitter_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _message_transmitter_(self):
+        self._token('BO_TX_BU_')
+        self._message_id_()
+        self._token(':')
+        self._transmitter_list_()
+        self._token(';')
+
+    @tatsumasu()
+    def _transmitter_list_(self):
+        self._transmitter_()
+
+        def block0():
+            self._token(',')
+            self._transmitter_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _environment_variables_(self):
+
+        def block0():
+            self._environment_variable_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _environment_variable_(self):
+        self._token('EV_')
+        self._env_var_name_()
+        self.name_last_node('env_var_name')
+        self._token(':')
+        self._env_var_type_()
+        self.name_last_node('env_var_type')
+        self._token('[')
+        self._minimum_()
+        self.name_last_node('minimum')
+        self._token('|')
+        self._maximum_()
+        self.name_last_node('maximum')
+        self._token(']')
+        self._unit_()
+        self.name_last_node('unit')
+        self._initial_value_()
+        self.name_last_node('initial_value')
+        self._ev_id_()
+        self.name_last_node('ev_id')
+        self._access_type_()
+        self.name_last_node('access_type')
+        self._access_node_list_()
+        self.name_last_node('access_nodes')
+        self._token(';')
+        self._define(['access_nodes', 'access_type', 'env_var_name', 'env_var_type', 'ev_id', 'initial_value', 'maximum', 'minimum', 'unit'], [])
+
+    @tatsumasu()
+    def _access_node_list_(self):
+        self._access_node_()
+        self.add_last_node_to_name('@')
+
+        def block0():
+            self._token(',')
+            self._access_node_()
+            self.add_last_node_to_name('@')
+        self._closure(block0)
+
+    @tatsumasu()
+    def _env_var_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('0')
+            with self._option():
+                self._token('1')
+            with self._option():
+                self._token('2')
+            self._error(
+                'expecting one of: '
+                "'0' '1' '2'"
+            )
+
+    @tatsumasu()
+    def _initial_value_(self):
+        self._double_()
+
+    @tatsumasu()
+    def _ev_id_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _access_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('DUMMY_NODE_VECTOR0')
+            with self._option():
+                self._token('DUMMY_NODE_VECTOR1')
+            with self._option():
+                self._token('DUMMY_NODE_VECTOR2')
+            with self._option():
+                self._token('DUMMY_NODE_VECTOR3')
+            with self._option():
+                self._token('DUMMY_NODE_VECTOR8000')
+            self._error(
+                'expecting one of: '
+                "'DUMMY_NODE_VECTOR0'"
+                "'DUMMY_NODE_VECTOR1'"
+                "'DUMMY_NODE_VECTOR2'"
+                "'DUMMY_NODE_VECTOR3'"
+                "'DUMMY_NODE_VECTOR8000'"
+            )
+
+    @tatsumasu()
+    def _access_node_(self):
+        with self._choice():
+            with self._option():
+                self._node_name_()
+            with self._option():
+                self._token('VECTOR_XXX')
+            self._error(
+                'expecting one of: '
+                "'VECTOR_XXX' (?!(?:BU_|BO_|SG_|EV_|VAL_T"
+                'ABLE_|CM_|BA_DEF_))[_a-zA-Z][-_a-'
+                'zA-Z0-9]* <C_identifier> <node_name>'
+            )
+
+    @tatsumasu()
+    def _environment_variables_data_(self):
+
+        def block0():
+            self._environment_variable_data_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _environment_variable_data_(self):
+        self._token('ENVVAR_DATA_')
+        self._env_var_name_()
+        self._token(':')
+        self._data_size_()
+        self._token(';')
+
+    @tatsumasu()
+    def _data_size_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _value_descriptions_(self):
+
+        def block0():
+            with self._choice():
+                with self._option():
+                    self._value_descriptions_for_signal_()
+                with self._option():
+                    self._value_descriptions_for_env_var_()
+                self._error(
+                    'expecting one of: '
+                    "'VAL_' <value_descriptions_for_env_var>"
+                    '<value_descriptions_for_signal>'
+                )
+        self._closure(block0)
+
+    @tatsumasu()
+    def _value_descriptions_for_signal_(self):
+        self._token('VAL_')
+        self._message_id_()
+        self._signal_name_()
+
+        def block0():
+            self._value_description_()
+        self._closure(block0)
+        self._token(';')
+
+    @tatsumasu()
+    def _value_descriptions_for_env_var_(self):
+        self._token('VAL_')
+        self._env_var_name_()
+
+        def block0():
+            self._value_description_()
+        self._closure(block0)
+        self._token(';')
+
+    @tatsumasu()
+    def _value_description_(self):
+        self._double_()
+        self._char_string_()
+
+    @tatsumasu()
+    def _signal_types_(self):
+
+        def block0():
+            self._signal_type_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _signal_type_(self):
+        self._token('SGTYPE_')
+        self._signal_type_name_()
+        self._token(':')
+        self._signal_size_()
+        self._token('@')
+        self._byte_order_()
+        self._value_type_()
+        self._token('(')
+        self._factor_()
+        self._token(',')
+        self._offset_()
+        self._token(')')
+        self._token('[')
+        self._minimum_()
+        self._token('|')
+        self._maximum_()
+        self._token(']')
+        self._unit_()
+        self._default_value_()
+        self._token(',')
+        self._signal_value_table_()
+        self._token(';')
+
+    @tatsumasu()
+    def _signal_type_name_(self):
+        self._C_identifier_()
+
+    @tatsumasu()
+    def _default_value_(self):
+        self._double_()
+
+    @tatsumasu()
+    def _signal_value_table_(self):
+        self._value_table_name_()
+
+    @tatsumasu()
+    def _signal_type_refs_(self):
+
+        def block0():
+            with self._choice():
+                with self._option():
+                    self._signal_type_ref_()
+                with self._option():
+                    self._signal_extended_value_type_list_()
+                self._error(
+                    'expecting one of: '
+                    "'SGTYPE_' 'SIG_VALTYPE_'"
+                    '<signal_extended_value_type_list>'
+                    '<signal_type_ref>'
+                )
+        self._closure(block0)
+
+    @tatsumasu()
+    def _signal_type_ref_(self):
+        self._token('SGTYPE_')
+        self._message_id_()
+        self._signal_name_()
+        self._token(':')
+        self._signal_type_name_()
+        self._token(';')
+
+    @tatsumasu()
+    def _signal_extended_value_type_list_(self):
+        self._token('SIG_VALTYPE_')
+        self._message_id_()
+        self._signal_name_()
+        with self._optional():
+            self._token(':')
+        self._signal_extended_value_type_()
+        self._token(';')
+
+    @tatsumasu()
+    def _signal_extended_value_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('0')
+            with self._option():
+                self._token('1')
+            with self._option():
+                self._token('2')
+            with self._option():
+                self._token('3')
+            self._error(
+                'expecting one of: '
+                "'0' '1' '2' '3'"
+            )
+
+    @tatsumasu()
+    def _signal_groups_(self):
+
+        def block0():
+            self._signal_group_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _signal_group_(self):
+        self._token('SIG_GROUP_')
+        self._message_id_()
+        self._signal_group_name_()
+        self._repetitions_()
+        self._token(':')
+
+        def block0():
+            self._signal_name_()
+        self._closure(block0)
+        self._token(';')
+
+    @tatsumasu()
+    def _signal_group_name_(self):
+        self._C_identifier_()
+
+    @tatsumasu()
+    def _repetitions_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _comments_(self):
+
+        def block0():
+            self._comment_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _comment_(self):
+        self._token('CM_')
+        with self._group():
+            with self._choice():
+                with self._option():
+                    self._char_string_()
+                with self._option():
+                    self._token('BU_')
+                    self._node_name_()
+                    self._char_string_()
+                with self._option():
+                    self._token('BO_')
+                    self._message_id_()
+                    self._char_string_()
+                with self._option():
+                    self._token('SG_')
+                    self._message_id_()
+                    self._signal_name_()
+                    self._char_string_()
+                with self._option():
+                    self._token('EV_')
+                    self._env_var_name_()
+                    self._char_string_()
+                self._error(
+                    'expecting one of: '
+                    "'BO_' 'BU_' 'EV_' 'SG_' <char_string>"
+                )
+        self._token(';')
+
+    @tatsumasu()
+    def _attribute_definitions_(self):
+
+        def block0():
+            with self._choice():
+                with self._option():
+                    self._attribute_definition_()
+                with self._option():
+                    self._attribute_definition_rel_()
+                self._error(
+                    'expecting one of: '
+                    "'BA_DEF_' 'BA_DEF_REL_'"
+                    '<attribute_definition>'
+                    '<attribute_definition_rel>'
+                )
+        self._closure(block0)
+
+    @tatsumasu()
+    def _attribute_definition_(self):
+        self._token('BA_DEF_')
+        with self._group():
+            with self._choice():
+                with self._option():
+                    self._attribute_name_()
+                    self._attribute_value_type_()
+                with self._option():
+                    self._object_type_()
+                    self._attribute_name_()
+                    self._attribute_value_type_()
+                self._error(
+                    'expecting one of: '
+                    '<attribute_name> <object_type>'
+                )
+        self._token(';')
+
+    @tatsumasu()
+    def _object_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('BU_')
+            with self._option():
+                self._token('BO_')
+            with self._option():
+                self._token('SG_')
+            with self._option():
+                self._token('EV_')
+            self._error(
+                'expecting one of: '
+                "'BO_' 'BU_' 'EV_' 'SG_'"
+            )
+
+    @tatsumasu()
+    def _attribute_name_(self):
+        self._token('"')
+        self._C_identifier_()
+        self.name_last_node('@')
+        self._token('"')
+
+    @tatsumasu()
+    def _attribute_definition_rel_(self):
+        self._token('BA_DEF_REL_')
+        self._attribute_rel_type_()
+        self._attribute_name_()
+        self._attribute_value_type_()
+        self._token(';')
+
+    @tatsumasu()
+    def _attribute_value_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('INT')
+                self._signed_integer_()
+                self._signed_integer_()
+            with self._option():
+                self._token('HEX')
+                self._signed_integer_()
+                self._signed_integer_()
+            with self._option():
+                self._token('FLOAT')
+                self._double_()
+                self._double_()
+            with self._option():
+                self._token('STRING')
+            with self._option():
+                self._token('ENUM')
+                with self._optional():
+                    self._char_string_()
+
+                    def block0():
+                        self._token(',')
+                        self._char_string_()
+                    self._closure(block0)
+            self._error(
+                'expecting one of: '
+                "'ENUM' 'FLOAT' 'HEX' 'INT' 'STRING'"
+            )
+
+    @tatsumasu()
+    def _attribute_defaults_(self):
+
+        def block0():
+            self._attribute_default_()
+        self._closure(block0)
+
+    @tatsumasu()
+    def _attribute_default_(self):
+        with self._group():
+            with self._choice():
+                with self._option():
+                    self._token('BA_DEF_DEF_REL_')
+                with self._option():
+                    self._token('BA_DEF_DEF_')
+                self._error(
+                    'expecting one of: '
+                    "'BA_DEF_DEF_' 'BA_DEF_DEF_REL_'"
+                )
+        self._attribute_name_()
+        self._attribute_value_()
+        self._token(';')
+
+    @tatsumasu()
+    def _attribute_value_(self):
+        with self._choice():
+            with self._option():
+                self._unsigned_integer_()
+            with self._option():
+                self._signed_integer_()
+            with self._option():
+                self._double_()
+            with self._option():
+                self._char_string_()
+            self._error(
+                'expecting one of: '
+                '<char_string> <double> <float> <sign>'
+                '<signed_integer> <unsigned_integer> [+-]'
+                '[0-9]+ \\"[^\\"]*\\"'
+            )
+
+    @tatsumasu()
+    def _attribute_values_(self):
+
+        def block0():
+            with self._choice():
+                with self._option():
+                    self._attribute_value_for_object_()
+                with self._option():
+                    self._attribute_value_rel_for_object_()
+                self._error(
+                    'expecting one of: '
+                    "'BA_' 'BA_REL_'"
+                    '<attribute_value_for_object>'
+                    '<attribute_value_rel_for_object>'
+                )
+        self._closure(block0)
+
+    @tatsumasu()
+    def _attribute_value_for_object_(self):
+        self._token('BA_')
+        self._attribute_name_()
+        with self._group():
+            with self._choice():
+                with self._option():
+                    self._attribute_value_()
+                with self._option():
+                    self._token('BU_')
+                    self._node_name_()
+                    self._attribute_value_()
+                with self._option():
+                    self._token('BO_')
+                    self._message_id_()
+                    self._attribute_value_()
+                with self._option():
+                    self._token('SG_')
+                    self._message_id_()
+                    self._signal_name_()
+                    self._attribute_value_()
+                with self._option():
+                    self._token('EV_')
+                    self._env_var_name_()
+                    self._attribute_value_()
+                self._error(
+                    'expecting one of: '
+                    "'BO_' 'BU_' 'EV_' 'SG_'"
+                    '<attribute_value>'
+                )
+        self._token(';')
+
+    @tatsumasu()
+    def _attribute_value_rel_for_object_(self):
+        self._token('BA_REL_')
+        self._attribute_name_()
+        self._attribute_rel_type_()
+        self._node_name_()
+        with self._group():
+            with self._choice():
+                with self._option():
+                    self._attribute_value_()
+                with self._option():
+                    self._token('BU_')
+                    self._node_name_()
+                    self._attribute_value_()
+                with self._option():
+                    self._token('BO_')
+                    self._message_id_()
+                    self._attribute_value_()
+                with self._option():
+                    self._token('SG_')
+                    self._message_id_()
+                    self._signal_name_()
+                    self._attribute_value_()
+                with self._option():
+                    self._token('EV_')
+                    self._env_var_name_()
+                    self._attribute_value_()
+                self._error(
+                    'expecting one of: '
+                    "'BO_' 'BU_' 'EV_' 'SG_'"
+                    '<attribute_value>'
+                )
+        self._token(';')
+
+    @tatsumasu()
+    def _attribute_rel_type_(self):
+        with self._choice():
+            with self._option():
+                self._token('BU_SG_REL_')
+            with self._option():
+                self._token('BU_EV_REL_')
+            with self._option():
+                self._token('BU_BO_REL_')
+            self._error(
+                'expecting one of: '
+                "'BU_BO_REL_' 'BU_EV_REL_' 'BU_SG_REL_'"
+            )
+
+    @tatsumasu()
+    def _value_table_name_(self):
+        self._C_identifier_()
+
+    @tatsumasu()
+    def _message_id_(self):
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _message_name_(self):
+        self._C_name_identifier_()
+
+    @tatsumasu()
+    def _signal_name_(self):
+        self._C_name_identifier_()
+
+    @tatsumasu()
+    def _env_var_name_(self):
+        self._C_name_identifier_()
+
+    @tatsumasu()
+    def _minimum_(self):
+        self._double_()
+
+    @tatsumasu()
+    def _maximum_(self):
+        self._double_()
+
+    @tatsumasu()
+    def _C_name_identifier_(self):
+        self._pattern('[_a-zA-Z][-_a-zA-Z0-9]*')
+
+    @tatsumasu()
+    def _C_identifier_(self):
+        self._pattern('(?!(?:BU_|BO_|SG_|EV_|VAL_TABLE_|CM_|BA_DEF_))[_a-zA-Z][-_a-zA-Z0-9]*')
+
+    @tatsumasu()
+    def _char_string_(self):
+        self._pattern('\\"[^\\"]*\\"')
+
+    @tatsumasu()
+    def _sign_(self):
+        self._pattern('[+-]')
+
+    @tatsumasu()
+    def _unsigned_integer_(self):
+        self._pattern('[0-9]+')
+
+    @tatsumasu()
+    def _signed_integer_(self):
+        with self._optional():
+            self._sign_()
+        self._unsigned_integer_()
+
+    @tatsumasu()
+    def _float_(self):
+        self._signed_integer_()
+        with self._optional():
+            self._token('.')
+            self._unsigned_integer_()
+
+    @tatsumasu()
+    def _exponent_(self):
+        self._pattern('[Ee]')
+
+    @tatsumasu()
+    def _double_(self):
+        self._float_()
+        with self._optional():
+            self._exponent_()
+            self._signed_integer_()
+
+
+def main(filename, **kwargs):
+    if not filename or filename == '-':
+        text = sys.stdin.read()
+    else:
+        text = Path(filename).read_text()
+    parser = DBCParser()
+    return parser.parse(
+        text,
+        filename=filename,
+        **kwargs,
+    )
+
+
+if __name__ == '__main__':
+    import json
+    from tatsu.util import asjson
+
+    ast = generic_main(main, DBCParser, name='DBC')
+    data = asjson(ast)
+    print(json.dumps(data, indent=2))
+
+GRAMMAR_DIGEST = '2073427b387b0a14d6538bf05fb519cdf89a4ae9d863943b4b8c37d245c58e7c'
@@ -1,16 +1,28 @@
 import argparse
-import json
+import hashlib
+import locale
+import mmap
 import abc
+import os
+import pickle
+import re
+import sys
+from array import array
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from tatsu import parse as tatsu_parse
-from tatsu import compile as tatsu_compile
-from tatsu import to_python_sourcecode
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, ValuesView
 
+GRAMMAR_FILE = Path(__file__).resolve().parent / 'grammar.ebnf'
+# The grammar has no left recursion and little backtracking, packrat memos cost more than they save
+TATSU_SETTINGS = {"memoization": False, "left_recursion": False}
 __grammar_model = None
+__grammar_key = None
 
 class DbcAttributeType(abc.ABC):
+    __slots__ = ()
     def __init__(self):
         pass
     def is_integer(self) -> bool:
@@ -25,6 +37,7 @@ class DbcAttributeType(abc.ABC):
         return False
 
 class DbcIntegerType(DbcAttributeType):
+    __slots__ = ('mininum', 'maximum')
     def __init__(self, mininum: int, maximum: int):
         super().__init__()
         self.mininum = mininum
@@ -33,6 +46,7 @@ class DbcIntegerType(DbcAttributeType):
         return True
 
 class DbcFloatType(DbcAttributeType):
+    __slots__ = ('mininum', 'maximum')
     def __init__(self, mininum: float, maximum: float):
         super().__init__()
         self.mininum = mininum
@@ -41,6 +55,7 @@ class DbcFloatType(DbcAttributeType):
         return True
 
 class DbcHexType(DbcAttributeType):
+    __slots__ = ('mininum', 'maximum')
     def __init__(self, mininum: int, maximum: int):
         super().__init__()
         self.mininum = mininum
@@ -49,6 +64,7 @@ class DbcHexType(DbcAttributeType):
         return True
 
 class DbcEnumType(DbcAttributeType):
+    __slots__ = ('labels',)
     def __init__(self):
         super().__init__()
         self.labels: List[str] = list()
@@ -58,6 +74,7 @@ class DbcEnumType(DbcAttributeType):
         return True
 
 class DbcStringType(DbcAttributeType):
+    __slots__ = ()
     def __init__(self):
         super().__init__()
     def is_string(self) -> bool:
@@ -74,19 +91,29 @@ class DbcAttributeObjectType(Enum):
     NODE_ENVIRONMENT_VARIABLE=7
 
 class DbcAttribute:
+    __slots__ = ('name', 'value_type', 'object_type', 'default', '_interned_values', '_values_by_token')
     def __init__(self, name: str, value_type: DbcAttributeType, object_type: DbcAttributeObjectType):
         self.name = name
         self.value_type = value_type
         self.object_type = object_type
         self.default: DbcAttributeValue = None
+        self._interned_values: Dict[object, DbcAttributeValue] = dict()
+        self._values_by_token: Dict[str, DbcAttributeValue] = dict()
     def has_default(self) -> bool:
         return self.default is not None
+    def intern_value(self, value) -> "DbcAttributeValue":
+        attr_value = self._interned_values.get(value)
+        if attr_value is None:
+            attr_value = DbcAttributeValue(self, value)
+            self._interned_values[value] = attr_value
+        return attr_value
     def __repr__(self) -> str:
         return f"DbcAttribute:{self.name}"
     def __str__(self) -> str:
         return f"DbcAttribute:{self.name}"
 
 class DbcAttributeValue:
+    __slots__ = ('name', 'attribute', 'value')
     def __init__(self, attribute: DbcAttribute, value):
         self.name = attribute.name
         self.attribute = attribute
@@ -96,15 +123,48 @@ class DbcAttributeValue:
     def __str__(self) -> str:
         return f"DbcAttributeValue:{self.name}={self.value}"
 
+class DbcAttributeDict(MutableMapping):
+    # Attribute values are kept as parsed tokens until first accessed
+    __slots__ = ('_values',)
+    def __init__(self):
+        self._values: Dict[str, object] = dict()
+    def add_parsed(self, attribute: DbcAttribute, ast):
+        self._values[attribute.name] = (ast, attribute)
+    def __getitem__(self, name: str) -> DbcAttributeValue:
+        attr = self._values[name]
+        if type(attr) is tuple:
+            ast, attribute = attr
+            attr = read_attribute_value(ast, attribute)
+            self._values[name] = attr
+        return attr
+    def __setitem__(self, name: str, attr: DbcAttributeValue):
+        self._values[name] = attr
+    def __delitem__(self, name: str):
+        del self._values[name]
+    def __contains__(self, name) -> bool:
+        return name in self._values
+    def __iter__(self):
+        return iter(self._values)
+    def __len__(self) -> int:
+        return len(self._values)
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
 class DbcNode:
+    __slots__ = ('name', 'description', 'attributes')
     def __init__(self, name: str):
         self.name = name
         self.description = "N/A"
-        self.attributes: Dict[str, DbcAttributeValue] = dict()
+        self.attributes: DbcAttributeDict = DbcAttributeDict()
     def add_attribute(self, attr: DbcAttributeValue):
         if attr.name in self.attributes:
             raise RuntimeError(f"Attribute {attr.name} already in signal {self.name}")
         self.attributes[attr.name] = attr
+    def add_parsed_attribute(self, attribute: DbcAttribute, ast):
+        if attribute.name in self.attributes:
+            self.add_attribute(read_attribute_value(ast, attribute))
+        else:
+            self.attributes.add_parsed(attribute, ast)
     def has_attribute(self, name: str) -> bool:
         return name in self.attributes
     def get_attribute(self, name: str) -> DbcAttributeValue:
@@ -126,7 +186,8 @@ class DbcSignalByteOrder(Enum):
     BIG_ENDIAN=1
 
 class DbcSignal:
-    def __init__(self, signal_name: str, start_bit: int, signal_size: int, byte_order: DbcSignalByteOrder, value_type: DbcSignalValueType, factor: float, offset: float, minimum: float, maximum: float, unit: str):
+    __slots__ = ('name', 'start_bit', 'size', 'byte_order', 'value_type', 'factor', 'offset', 'minimum', 'maximum', 'unit', 'receivers', 'attributes', 'node_attributes', 'description', 'value_descriptions', '_value_labels')
+    def __init__(self, signal_name: str, start_bit: int, signal_size: int, byte_order: DbcSignalByteOrder, value_type: DbcSignalValueType, factor: float, offset: float, minimum: Optional[float], maximum: Optional[float], unit: str):
         self.name = signal_name
         self.start_bit = start_bit
         self.size = signal_size
@@ -138,10 +199,11 @@ class DbcSignal:
         self.maximum = maximum
         self.unit = unit
         self.receivers: List[DbcNode] = list()
-        self.attributes: Dict[str, DbcAttributeValue] = dict()
+        self.attributes: DbcAttributeDict = DbcAttributeDict()
         self.node_attributes: Dict[str, Dict[str, DbcAttributeValue]] = dict()
         self.description: str = "N/A"
         self.value_descriptions: List[Tuple[float, str]] = list()
+        self._value_labels: Optional[Dict[float, str]] = None
     def _add_receiver(self, node: DbcNode):
         self.receivers.append(node)
     def add_attribute(self, attr: DbcAttributeValue):
@@ -163,6 +225,11 @@ class DbcSignal:
         if not attr.name in self.node_attributes:
             self.node_attributes[attr.name] = dict()
         self.node_attributes[attr.name][node] = attr
+    def add_parsed_attribute(self, attribute: DbcAttribute, ast):
+        if attribute.name in self.attributes:
+            self.add_attribute(read_attribute_value(ast, attribute))
+        else:
+            self.attributes.add_parsed(attribute, ast)
     def has_attribute(self, name: str) -> bool:
         return name in self.attributes
     def get_attribute(self, name: str) -> DbcAttributeValue:
@@ -175,12 +242,22 @@ class DbcSignal:
         return attr_dict
     def add_value_description(self, val: float, label: str):
         self.value_descriptions.append((val, label))
+        self._value_labels = None
+    def add_value_descriptions(self, values: Iterable[Tuple[float, str]]):
+        self.value_descriptions.extend(values)
+        self._value_labels = None
+    def get_value_label(self, val: float) -> str:
+        # Lookup is built on first use, direct edits of value_descriptions are not tracked
+        if self._value_labels is None:
+            self._value_labels = dict(self.value_descriptions)
+        return self._value_labels[val]
     def __repr__(self) -> str:
         return f"DbcSignal:{self.name}"
     def __str__(self) -> str:
         return f"DbcSignal:{self.name}"
 
 class DbcSignalGroup:
+    __slots__ = ('name', 'repetitions', 'signals')
     def __init__(self, name: str, repetitions: int):
         self.name = name
         self.repetitions = repetitions
@@ -192,7 +269,29 @@ class DbcSignalGroup:
     def __str__(self) -> str:
         return f"DbcSignalGroup:{self.name}"
 
+class DbcSignalLayout:
+    # Signal fields of a message packed in contiguous arrays, in signal order
+    __slots__ = ('message_ids', 'start_bits', 'sizes', 'byte_orders', 'factors', 'offsets')
+    def __init__(self, signals: Iterable[DbcSignal], message_id: int = 0):
+        signals = tuple(signals)
+        self.message_ids = array('q', [message_id]) * len(signals)
+        self.start_bits = array('i', [signal.start_bit for signal in signals])
+        self.sizes = array('i', [signal.size for signal in signals])
+        self.byte_orders = array('B', [signal.byte_order.value for signal in signals])
+        self.factors = array('d', [signal.factor for signal in signals])
+        self.offsets = array('d', [signal.offset for signal in signals])
+    def extend(self, other: "DbcSignalLayout"):
+        self.message_ids.extend(other.message_ids)
+        self.start_bits.extend(other.start_bits)
+        self.sizes.extend(other.sizes)
+        self.byte_orders.extend(other.byte_orders)
+        self.factors.extend(other.factors)
+        self.offsets.extend(other.offsets)
+    def __len__(self) -> int:
+        return len(self.start_bits)
+
 class DbcMessage:
+    __slots__ = ('id', 'name', 'size', 'description', 'transmitter', 'signals_by_name', 'attributes', 'node_attributes', 'signal_groups', '_signal_layout', '_signals_tuple')
     def __init__(self, message_id: int, message_name: str, message_size: int, transmitter: DbcNode):
         self.id = message_id
         self.name = message_name
@@ -200,9 +299,11 @@ class DbcMessage:
         self.description = "N/A"
         self.transmitter = transmitter
         self.signals_by_name: Dict[str, DbcSignal] = dict()
-        self.attributes: Dict[str, DbcAttributeValue] = dict()
+        self.attributes: DbcAttributeDict = DbcAttributeDict()
         self.node_attributes: Dict[str, Dict[str, DbcAttributeValue]] = dict()
         self.signal_groups: List[DbcSignalGroup] = list()
+        self._signal_layout: Optional[DbcSignalLayout] = None
+        self._signals_tuple: Optional[Tuple[DbcSignal, ...]] = None
     def add_attribute(self, attr: DbcAttributeValue):
         if attr.name in self.attributes:
             curr_attr = self.attributes[attr.name]
@@ -222,6 +323,11 @@ class DbcMessage:
         if not attr.name in self.node_attributes:
             self.node_attributes[attr.name] = dict()
         self.node_attributes[attr.name][node] = attr
+    def add_parsed_attribute(self, attribute: DbcAttribute, ast):
+        if attribute.name in self.attributes:
+            self.add_attribute(read_attribute_value(ast, attribute))
+        else:
+            self.attributes.add_parsed(attribute, ast)
     def has_attribute(self, name: str) -> bool:
         return name in self.attributes
     def get_attribute(self, name: str) -> DbcAttributeValue:
@@ -236,12 +342,22 @@ class DbcMessage:
         if signal.name in self.signals_by_name:
             raise RuntimeError(f"Signal {signal.name} already in message {self.name}")
         self.signals_by_name[signal.name] = signal
+        self._signal_layout = None
+        self._signals_tuple = None
     def _add_signal_group(self, sg: DbcSignalGroup):
         self.signal_groups.append(sg)
-    def get_signals(self) -> List[DbcSignal]:
-        return list(self.signals_by_name.values())
+    def get_signals(self) -> ValuesView[DbcSignal]:
+        return self.signals_by_name.values()
+    def get_signals_tuple(self) -> Tuple[DbcSignal, ...]:
+        if self._signals_tuple is None:
+            self._signals_tuple = tuple(self.signals_by_name.values())
+        return self._signals_tuple
     def get_signal(self, name: str) -> DbcSignal:
         return self.signals_by_name[name]
+    def get_signal_layout(self) -> DbcSignalLayout:
+        if self._signal_layout is None:
+            self._signal_layout = DbcSignalLayout(self.get_signals(), self.id)
+        return self._signal_layout
     def __repr__(self) -> str:
         return f"DbcMessage:{self.name}"
     def __str__(self) -> str:
@@ -260,7 +376,8 @@ class DbcEnvironmentVariableAccessType(Enum):
     READ_WRITE=3
 
 class DbcEnvironmentVariable:
-    def __init__(self, name: str, type: DbcEnvironmentVariableType, data_size: int, min: float, max: float, unit: str, init_value: float, id: int, access_type: DbcEnvironmentVariableAccessType):
+    __slots__ = ('name', 'type', 'minimum', 'maximum', 'unit', 'init_value', 'id', 'access_type', 'access_nodes', 'description', 'attributes', 'node_attributes', 'value_descriptions', '_value_labels', 'data_size')
+    def __init__(self, name: str, type: DbcEnvironmentVariableType, data_size: int, min: Optional[float], max: Optional[float], unit: str, init_value: Optional[float], id: int, access_type: DbcEnvironmentVariableAccessType):
         self.name = name
         self.type = type
         self.minimum = min
@@ -271,9 +388,10 @@ class DbcEnvironmentVariable:
         self.access_type = access_type
         self.access_nodes: List[DbcNode] = list()
         self.description: str = "N/A"
-        self.attributes: Dict[str, DbcAttributeValue] = dict()
+        self.attributes: DbcAttributeDict = DbcAttributeDict()
         self.node_attributes: Dict[str, Dict[str, DbcAttributeValue]] = dict()
         self.value_descriptions: List[Tuple[float, str]] = list()
+        self._value_labels: Optional[Dict[float, str]] = None
         self.data_size: int = 0
     def _add_access_node(self, node: DbcNode):
         self.access_nodes.append(node)
@@ -296,6 +414,11 @@ class DbcEnvironmentVariable:
         if not attr.name in self.node_attributes:
             self.node_attributes[attr.name] = dict()
         self.node_attributes[attr.name][node] = attr
+    def add_parsed_attribute(self, attribute: DbcAttribute, ast):
+        if attribute.name in self.attributes:
+            self.add_attribute(read_attribute_value(ast, attribute))
+        else:
+            self.attributes.add_parsed(attribute, ast)
     def has_attribute(self, name: str) -> bool:
         return name in self.attributes
     def get_attribute(self, name: str) -> DbcAttributeValue:
@@ -308,12 +431,22 @@ class DbcEnvironmentVariable:
         return attr_dict
     def add_value_description(self, val: float, label: str):
         self.value_descriptions.append((val, label))
+        self._value_labels = None
+    def add_value_descriptions(self, values: Iterable[Tuple[float, str]]):
+        self.value_descriptions.extend(values)
+        self._value_labels = None
+    def get_value_label(self, val: float) -> str:
+        # Lookup is built on first use, direct edits of value_descriptions are not tracked
+        if self._value_labels is None:
+            self._value_labels = dict(self.value_descriptions)
+        return self._value_labels[val]
     def __repr__(self) -> str:
         return f"DbcEnvironmentVariable:{self.name}"
     def __str__(self) -> str:
         return f"DbcEnvironmentVariable:{self.name}"
 
 class DbcValueTable:
+    __slots__ = ('name', 'values')
     def __init__(self, name: str):
         self.name = name
         self.values: List[Tuple[str, float]] = list()
@@ -321,6 +454,7 @@ class DbcValueTable:
         self.values.append((label, value))
 
 class DbcFile:
+    __slots__ = ('version', 'nodes_by_name', 'messages_by_id', 'environment_variables_by_name', 'attribute_definitions', 'attribute_values', 'value_tables_by_name', '_signals_by_key')
     def __init__(self):
         self.version = "N/A"
         self.nodes_by_name: Dict[str, DbcNode] = dict()
@@ -329,10 +463,13 @@ class DbcFile:
         self.attribute_definitions: Dict[str, DbcAttribute] = dict()
         self.attribute_values: Dict[str, DbcAttributeValue] = dict()
         self.value_tables_by_name: Dict[str, DbcValueTable] = dict()
+        self._signals_by_key: Dict[Tuple[int, str], DbcSignal] = dict()
     def _add_message(self, message: DbcMessage):
         if message.id in self.messages_by_id:
             raise RuntimeError(f"Message {message.id} already in Dbc")
         self.messages_by_id[message.id] = message
+        for signal in message.get_signals():
+            self._signals_by_key[(message.id, signal.name)] = signal
     def _add_value_table(self, vtable: DbcValueTable):
         if vtable.name in self.value_tables_by_name:
             raise RuntimeError(f"Value table {vtable.name} already in Dbc")
@@ -354,6 +491,11 @@ class DbcFile:
     def get_attribute_definition(self, name: str) -> DbcAttribute:
         attr = self.attribute_definitions[name]
         return attr
+    def resolve_attribute(self, obj, name: str) -> DbcAttributeValue:
+        # Defaults are not copied into objects; the definition's value is shared
+        if obj.has_attribute(name):
+            return obj.get_attribute(name)
+        return self.attribute_definitions[name].default
     def add_attribute_value(self, attr: DbcAttributeValue):
         if attr.name in self.attribute_values:
             raise RuntimeError(f"Attribute {attr.name} already in Dbc")
@@ -375,6 +517,18 @@ class DbcFile:
         return self.messages_by_id[id]
     def get_messages(self) -> List[DbcMessage]:
         return list(self.messages_by_id.values())
+    def get_message_signal(self, id: int, name: str) -> DbcSignal:
+        signal = self._signals_by_key.get((id, name))
+        if signal is None:
+            # Signals added after the message joined the file are not indexed
+            return self.messages_by_id[id].get_signal(name)
+        return signal
+    def get_signal_layout(self) -> DbcSignalLayout:
+        # Signals of all messages, in message order
+        layout = DbcSignalLayout([])
+        for message in self.messages_by_id.values():
+            layout.extend(message.get_signal_layout())
+        return layout
     def has_value_table(self, name: str) -> bool:
         return name in self.value_tables_by_name
     def get_value_table(self, name: str) -> DbcValueTable:
@@ -394,53 +548,73 @@ def read_char_string(value: str) -> str:
     else:
         return value
 
-def read_float_with_default(value: str, default: float) -> float:
+# Labels, units and names repeat across a file, share one string per token.
+# Free text such as comments goes through read_char_string instead.
+@lru_cache(maxsize=65536)
+def read_interned_string(value: str) -> str:
+    return sys.intern(read_char_string(value))
+
+def read_float_with_default(value, default: Optional[float]) -> Optional[float]:
     if not value:
         return default
     else:
         return read_float(value)
 
-def read_float(value: str) -> float:
-        num_str = join_parsed_number(value)
-        return float(num_str)
+def read_float(value) -> float:
+    if isinstance(value, str):
+        return float(value)
+    num_str = join_parsed_number(value)
+    return float(num_str)
 
-def read_int(value: str) -> int:
+def read_int(value) -> int:
+    if isinstance(value, str):
+        return int(value)
     num_str = join_parsed_number(value)
     return int(num_str)
 
+def read_value_descriptions(values) -> List[Tuple[float, str]]:
+    # Convert the value and label columns in bulk rather than per pair
+    if not values:
+        return []
+    numbers, labels = zip(*values)
+    return list(zip(map(read_float, numbers), map(read_interned_string, labels)))
+
+_ENV_VAR_TYPES = {
+    "0": DbcEnvironmentVariableType.INTEGER,
+    "1": DbcEnvironmentVariableType.FLOAT,
+    "2": DbcEnvironmentVariableType.STRING,
+}
+
 def read_env_var_type(value: str) -> DbcEnvironmentVariableType:
-    if value == "0":
-        return DbcEnvironmentVariableType.INTEGER
-    elif value == "1":
-        return DbcEnvironmentVariableType.FLOAT
-    elif value == "2":
-        return DbcEnvironmentVariableType.STRING
-    else:
+    try:
+        return _ENV_VAR_TYPES[value]
+    except KeyError:
         raise RuntimeError(f"Unexpecte evar type {value}")
 
+_ENV_VAR_ACCESS_TYPES = {
+    "DUMMY_NODE_VECTOR0": DbcEnvironmentVariableAccessType.UNRESTRICTED,
+    "DUMMY_NODE_VECTOR1": DbcEnvironmentVariableAccessType.READ,
+    "DUMMY_NODE_VECTOR2": DbcEnvironmentVariableAccessType.WRITE,
+    "DUMMY_NODE_VECTOR3": DbcEnvironmentVariableAccessType.READ_WRITE,
+    "DUMMY_NODE_VECTOR8000": DbcEnvironmentVariableAccessType.UNRESTRICTED,
+}
+
 def read_env_var_access_type(value: str) -> DbcEnvironmentVariableAccessType:
-    if value == "DUMMY_NODE_VECTOR0":
-        return DbcEnvironmentVariableAccessType.UNRESTRICTED
-    elif value == "DUMMY_NODE_VECTOR1":
-        return DbcEnvironmentVariableAccessType.READ
-    elif value == "DUMMY_NODE_VECTOR2":
-        return DbcEnvironmentVariableAccessType.WRITE
-    elif value == "DUMMY_NODE_VECTOR3":
-        return DbcEnvironmentVariableAccessType.READ_WRITE
-    elif value == "DUMMY_NODE_VECTOR8000":
-        return DbcEnvironmentVariableAccessType.UNRESTRICTED
-    else:
+    try:
+        return _ENV_VAR_ACCESS_TYPES[value]
+    except KeyError:
         raise RuntimeError(f"Unexpecte evar access type {value}")
 
 def join_parsed_number(ast) -> str:
-    result = ""
-    for node in ast:
+    parts: List[str] = list()
+    stack = [ast]
+    while stack:
+        node = stack.pop()
         if isinstance(node, str):
-            result += node
+            parts.append(node)
         else:
-            node_str = join_parsed_number(node)
-            result += node_str
-    return result
+            stack.extend(reversed(node))
+    return "".join(parts)
 
 def read_attribute_value_type(ast) -> DbcAttributeType:
     if len(ast) == 3:
@@ -454,17 +628,17 @@ def read_attribute_value_type(ast) -> DbcAttributeType:
             max = int(ast[2])
             return DbcHexType(min, max)
         elif attr_type == "FLOAT":
-            min = float(ast[1])
-            max = float(ast[2])
+            min = read_float(ast[1])
+            max = read_float(ast[2])
             return DbcFloatType(min, max)
         elif attr_type == "ENUM":
             val1 = DbcEnumType()
             if len(ast) > 1:
-                first_label = read_char_string(ast[1])
+                first_label = read_interned_string(ast[1])
                 val1.add_label(first_label)
                 more_labels = ast[2]
                 for more_label in more_labels:
-                    label = read_char_string(more_label[1])
+                    label = read_interned_string(more_label[1])
                     val1.add_label(label)
             return val1
         else:
@@ -474,55 +648,324 @@ def read_attribute_value_type(ast) -> DbcAttributeType:
     else:
         raise NotImplementedError(f"TODO")
 
+_ATTRIBUTE_OBJECT_TYPES = {
+    ("BA_DEF_", "BU_"): DbcAttributeObjectType.NODE,
+    ("BA_DEF_", "BO_"): DbcAttributeObjectType.MESSAGE,
+    ("BA_DEF_", "SG_"): DbcAttributeObjectType.SIGNAL,
+    ("BA_DEF_", "EV_"): DbcAttributeObjectType.ENVIRONMENT_VARIABLE,
+    ("BA_DEF_REL_", "BU_BO_REL_"): DbcAttributeObjectType.NODE_MESSAGE,
+    ("BA_DEF_REL_", "BU_SG_REL_"): DbcAttributeObjectType.NODE_SIGNAL,
+    ("BA_DEF_REL_", "BU_EV_REL_"): DbcAttributeObjectType.NODE_ENVIRONMENT_VARIABLE,
+}
+
+def read_attribute_object_type(attr_type: str, object_type: str) -> DbcAttributeObjectType:
+    try:
+        return _ATTRIBUTE_OBJECT_TYPES[(attr_type, object_type)]
+    except KeyError:
+        raise RuntimeError(f"Unexpected object {object_type} for attribute definition")
+
 def read_attribute_value(ast, attribute: DbcAttribute) -> DbcAttributeValue:
+    if isinstance(ast, str):
+        # Repeated tokens resolve to the same value without converting them again
+        attr_value = attribute._values_by_token.get(ast)
+        if attr_value is None:
+            attr_value = convert_attribute_value(ast, attribute)
+            attribute._values_by_token[ast] = attr_value
+        return attr_value
+    return convert_attribute_value(ast, attribute)
+
+def convert_attribute_value(ast, attribute: DbcAttribute) -> DbcAttributeValue:
     value_type = attribute.value_type
     if value_type.is_integer():
         value = int(ast)
-        return DbcAttributeValue(attribute, value)
+        return attribute.intern_value(value)
     elif value_type.is_hex():
         value = int(ast)
-        return DbcAttributeValue(attribute, value)
+        return attribute.intern_value(value)
     elif value_type.is_float():
-        value = float(ast)
-        return DbcAttributeValue(attribute, value)
+        value = read_float(ast)
+        return attribute.intern_value(value)
     elif value_type.is_string():
         value = read_char_string(ast)
-        return DbcAttributeValue(attribute, value)
+        return attribute.intern_value(value)
     elif value_type.is_enum():
         value = read_char_string(ast)
-        return DbcAttributeValue(attribute, value)
+        return attribute.intern_value(value)
     else:
         raise NotImplementedError(f"TODO")
 
+_SIGNAL_VALUE_TYPES = {
+    "+": DbcSignalValueType.UNSIGNED,
+    "-": DbcSignalValueType.SIGNED,
+}
+
 def read_signal_value_type(ast) -> DbcSignalValueType:
-    if ast == "+":
-        return DbcSignalValueType.UNSIGNED
-    elif ast == "-":
-        return DbcSignalValueType.SIGNED
-    else:
+    try:
+        return _SIGNAL_VALUE_TYPES[ast]
+    except KeyError:
         raise RuntimeError(f"Unexpected signal value type {ast}")
 
+_BYTE_ORDERS = {
+    "0": DbcSignalByteOrder.LITTLE_ENDIAN,
+    "1": DbcSignalByteOrder.BIG_ENDIAN,
+}
+
 def read_byte_order(ast) -> DbcSignalByteOrder:
-    if ast == "0":
-        return DbcSignalByteOrder.LITTLE_ENDIAN
-    elif ast == "1":
-        return DbcSignalByteOrder.BIG_ENDIAN
-    else:
+    try:
+        return _BYTE_ORDERS[ast]
+    except KeyError:
         raise RuntimeError(f"Unexpected signal byte_order {ast}")
 
+# '0' keeps the integer value type of the signal
+_EXTENDED_VALUE_TYPES = {
+    "0": None,
+    "1": DbcSignalValueType.FLOAT32,
+    "2": DbcSignalValueType.FLOAT64,
+}
+
 def read_extended_value_type(ast, sig: DbcSignal) -> DbcSignalValueType:
-    if ast == '0':
-        return sig.value_type
-    elif ast == '1':
-        return DbcSignalValueType.FLOAT32
-    elif ast == '2':
-        return DbcSignalValueType.FLOAT64
-    else:
+    try:
+        value_type = _EXTENDED_VALUE_TYPES[ast]
+    except KeyError:
         raise RuntimeError(f"Unexpected extended value type {ast}")
+    if value_type is None:
+        return sig.value_type
+    return value_type
 
-class DbcFactory:
+# Line oriented scanner producing the same AST layout as grammar.ebnf
+class DbcUnknownKeywordError(RuntimeError):
+    pass
+
+class DbcScanner:
+    # Statements not terminated by ';'
+    UNTERMINATED_KEYWORDS = frozenset(("VERSION", "NS_", "BS_", "BU_", "BO_", "SG_"))
+    # Statements accepted by the grammar but not used by DbcFactory
+    IGNORED_KEYWORDS = frozenset(("BS_", "BO_TX_BU_", "SGTYPE_", "SIG_TYPE_REF_", "SGTYPE_VAL_", "BA_DEF_SGTYPE_", "BA_SGTYPE_", "SIGTYPE_VALTYPE_", "SG_MUL_VAL_", "CAT_DEF_", "CAT_", "FILTER", "EV_DATA_", "BA_DEF_DEF_SGTYPE_"))
+    TOKEN_RE = re.compile(r'"[^"]*"|[^\s",:;|@()\[\]]+|[,:;|@()\[\]]')
+    SIGNAL_RE = re.compile(r'([^\s:]+)\s*(?:([^\s:]+)\s*)?:\s*(\d+)\s*\|\s*(\d+)\s*@\s*([01])\s*([+-])\s*\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)\s*\[\s*([^|\s]+)\s*\|\s*([^\]\s]+)\s*\]\s*("[^"]*")\s*(.*)', re.S)
     def __init__(self):
+        self._scanners = {
+            "VERSION": self._scan_version,
+            "BU_": self._scan_nodes,
+            "VAL_TABLE_": self._scan_value_table,
+            "BO_": self._scan_message,
+            "SG_": self._scan_signal,
+            "EV_": self._scan_environment_variable,
+            "ENVVAR_DATA_": self._scan_environment_variable_data,
+            "CM_": self._scan_comment,
+            "BA_DEF_": self._scan_attribute_definition,
+            "BA_DEF_REL_": self._scan_attribute_definition,
+            "BA_DEF_DEF_": self._scan_attribute_default,
+            "BA_DEF_DEF_REL_": self._scan_attribute_default,
+            "BA_": self._scan_attribute_value,
+            "BA_REL_": self._scan_attribute_value,
+            "VAL_": self._scan_value_description,
+            "SIG_VALTYPE_": self._scan_signal_type_ref,
+            "SIG_GROUP_": self._scan_signal_group,
+        }
+        for keyword in self.IGNORED_KEYWORDS:
+            self._scanners[keyword] = self._scan_ignored
+    def parse(self, text: str) -> dict:
+        ast = {
+            "version": None,
+            "nodes": {"node_names": []},
+            "value_tables": [],
+            "messages": [],
+            "environment_variables": [],
+            "environment_variables_data": [],
+            "comments": [],
+            "attribute_definitions": [],
+            "attribute_defaults": [],
+            "attribute_values": [],
+            "value_descriptions": [],
+            "signal_type_refs": [],
+            "signal_groups": [],
+        }
+        scanners = self._scanners
+        lines = text.splitlines()
+        num_lines = len(lines)
+        i = 0
+        # Signals are only valid right after their message or another signal
+        in_message = False
+        while i < num_lines:
+            line = lines[i].strip()
+            i += 1
+            if not line:
+                continue
+            parts = line.split(None, 1)
+            keyword = parts[0].rstrip(":")
+            rest = parts[1] if len(parts) > 1 else ""
+            if keyword == "NS_":
+                # Skip the symbol list, one bare keyword per line
+                while i < num_lines:
+                    symbol = lines[i].strip()
+                    if ":" in symbol or len(symbol.split(None, 1)) > 1:
+                        break
+                    i += 1
+                continue
+            if keyword not in self.UNTERMINATED_KEYWORDS:
+                while not rest.endswith(";") or rest.count('"') % 2 != 0:
+                    if i >= num_lines:
+                        raise RuntimeError(f"Unterminated statement {line}")
+                    rest = rest + "\n" + lines[i].rstrip()
+                    i += 1
+            scanner = scanners.get(keyword)
+            if scanner is None:
+                raise DbcUnknownKeywordError(f"Unexpected keyword {keyword}")
+            if keyword == "SG_" and not in_message:
+                raise RuntimeError(f"Signal {rest.split(None, 1)[0] if rest else ''} outside of a message")
+            in_message = keyword in ("BO_", "SG_")
+            try:
+                scanner(keyword, rest, ast)
+            except (IndexError, ValueError) as e:
+                raise RuntimeError(f"Unexpected statement {keyword} {rest}") from e
+        return ast
+    def _scan_version(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["version"] = (keyword, tokens[0])
+    def _scan_nodes(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["nodes"]["node_names"].extend(token for token in tokens if token != ":")
+    def _scan_value_table(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        values = list(zip(tokens[1:-1:2], tokens[2:-1:2]))
+        ast["value_tables"].append((keyword, tokens[0], values, ";"))
+    def _scan_message(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        message = {
+            "message_id": tokens[0],
+            "message_name": tokens[1],
+            "message_size": tokens[3],
+            "transmitter": tokens[4],
+            "signals": [],
+        }
+        ast["messages"].append(message)
+    def _scan_ignored(self, keyword: str, rest: str, ast: dict):
         pass
+    def _scan_signal(self, keyword: str, rest: str, ast: dict):
+        messages = ast["messages"]
+        match = self.SIGNAL_RE.match(rest)
+        if match is None:
+            raise RuntimeError(f"Unexpected statement SG_ {rest}")
+        signal = {
+            "signal_name": match[1],
+            "start_bit": match[3],
+            "signal_size": match[4],
+            "byte_order": match[5],
+            "value_type": match[6],
+            "factor": match[7],
+            "offset": match[8],
+            "minimum": match[9],
+            "maximum": match[10],
+            "unit": match[11],
+            "receivers": match[12].replace(",", " ").split(),
+        }
+        messages[-1]["signals"].append(signal)
+    def _scan_environment_variable(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        environment_variable = {
+            "env_var_name": tokens[0],
+            "env_var_type": tokens[2],
+            "minimum": tokens[4],
+            "maximum": tokens[6],
+            "unit": tokens[8],
+            "initial_value": tokens[9],
+            "ev_id": tokens[10],
+            "access_type": tokens[11],
+            "access_nodes": [token for token in tokens[12:-1] if token != ","],
+        }
+        ast["environment_variables"].append(environment_variable)
+    def _scan_environment_variable_data(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["environment_variables_data"].append((keyword, *tokens))
+    def _scan_comment(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["comments"].append((keyword, *tokens))
+    def _scan_attribute_definition(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        if tokens[0][0] == '"':
+            head = (keyword, read_interned_string(tokens[0]))
+            type_tokens = tokens[1:-1]
+        else:
+            head = (keyword, tokens[0], read_interned_string(tokens[1]))
+            type_tokens = tokens[2:-1]
+        value_type = type_tokens[0]
+        if value_type == "ENUM":
+            labels = [token for token in type_tokens[1:] if token != ","]
+            if labels:
+                value_type = ("ENUM", labels[0], [(",", label) for label in labels[1:]])
+        elif value_type != "STRING":
+            value_type = (value_type, type_tokens[1], type_tokens[2])
+        ast["attribute_definitions"].append((*head, value_type, ";"))
+    def _scan_attribute_default(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["attribute_defaults"].append((keyword, read_interned_string(tokens[0]), *tokens[1:]))
+    def _scan_attribute_value(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["attribute_values"].append((keyword, read_interned_string(tokens[0]), *tokens[1:]))
+    def _scan_value_description(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        if len(tokens) % 2 == 1:
+            values = list(zip(tokens[2:-1:2], tokens[3:-1:2]))
+            ast["value_descriptions"].append((keyword, tokens[0], tokens[1], values, ";"))
+        else:
+            values = list(zip(tokens[1:-1:2], tokens[2:-1:2]))
+            ast["value_descriptions"].append((keyword, tokens[0], values, ";"))
+    def _scan_signal_type_ref(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        ast["signal_type_refs"].append((keyword, tokens[0], tokens[1], ":", tokens[-2], ";"))
+    def _scan_signal_group(self, keyword: str, rest: str, ast: dict):
+        tokens = self.TOKEN_RE.findall(rest)
+        signal_names = [token for token in tokens[4:-1] if token != ","]
+        ast["signal_groups"].append((keyword, *tokens[:4], signal_names, ";"))
+
+def consume_statements(statements):
+    # Release each parsed statement once it has been turned into objects
+    if not isinstance(statements, list):
+        yield from statements
+        return
+    for i, statement in enumerate(statements):
+        statements[i] = None
+        yield statement
+
+class DbcFactory:
+    def __init__(self):
+        # Declarations first, then the statements referring to them
+        self._passes = (
+            self._process_version,
+            self._process_nodes,
+            self._process_value_tables,
+            self._process_messages,
+            self._process_environment_variables,
+            self._process_environment_variables_data,
+            self._process_comments,
+            self._process_attributes,
+            self._process_value_descriptions,
+            self._process_signal_type_refs,
+            self._process_signal_groups,
+        )
+        # (token length, object_type) -> handler for comments
+        self._comment_handlers = {
+            (3, None): self._process_global_comment,
+            (5, "BU_"): self._process_node_comment,
+            (5, "BO_"): self._process_message_comment,
+            (5, "EV_"): self._process_ev_comment,
+            (6, "SG_"): self._process_signal_comment,
+        }
+        # (attr_type, token length, object_type) -> handler for attribute values
+        self._attribute_value_handlers = {
+            ("BA_", 4, None): self._process_global_attribute_value,
+            ("BA_", 6, "BU_"): self._process_node_attribute_value,
+            ("BA_", 6, "BO_"): self._process_message_attribute_value,
+            ("BA_", 6, "EV_"): self._process_ev_attribute_value,
+            ("BA_", 7, "SG_"): self._process_signal_attribute_value,
+            ("BA_REL_", 6, "BU_BO_REL_"): self._process_node_rel_attribute_value,
+            ("BA_REL_", 6, "BU_SG_REL_"): self._process_node_rel_attribute_value,
+            ("BA_REL_", 6, "BU_EV_REL_"): self._process_node_rel_attribute_value,
+            ("BA_REL_", 8, "BU_BO_REL_"): self._process_node_message_attribute_value,
+            ("BA_REL_", 8, "BU_EV_REL_"): self._process_node_ev_attribute_value,
+            ("BA_REL_", 9, "BU_SG_REL_"): self._process_node_signal_attribute_value,
+        }
     def create_node(self, parsed_node) -> DbcNode:
         name = parsed_node
         node = DbcNode(name)
@@ -537,13 +980,11 @@ class DbcFactory:
         offset = read_float_with_default(parsed_signal["offset"], 0.0)
         minimum = read_float_with_default(parsed_signal["minimum"], None)
         maximum = read_float_with_default(parsed_signal["maximum"], None)
-        unit = read_char_string(parsed_signal["unit"])
+        unit = read_interned_string(parsed_signal["unit"])
         signal = DbcSignal(signal_name, start_bit, signal_size, byte_order, value_type, factor, offset, minimum, maximum, unit)
         receivers = parsed_signal["receivers"]
-        for receiver in receivers:
-            if receiver != "Vector__XXX":
-                anode = dbc.nodes_by_name[receiver]
-                signal._add_receiver(anode)
+        nodes_by_name = dbc.nodes_by_name
+        signal.receivers = [nodes_by_name[receiver] for receiver in receivers if receiver != "Vector__XXX"]
         return signal
     def create_message(self, parsed_message, dbc: DbcFile) -> DbcMessage:
         message_id = read_int(parsed_message["message_id"])
@@ -556,21 +997,22 @@ class DbcFactory:
             transmitter = None
         message = DbcMessage(message_id, message_name, message_size, transmitter)
         parsed_signals = parsed_message["signals"]
+        create_signal = self.create_signal
+        add_signal = message._add_signal
         for parsed_signal in parsed_signals:
-            signal = self.create_signal(parsed_signal, dbc)
-            message._add_signal(signal)
+            add_signal(create_signal(parsed_signal, dbc))
         return message
     def create_environment_variable(self, parsed_ev, dbc: DbcFile) -> DbcEnvironmentVariable:
-        ev_name = parsed_ev[1]
-        ev_type = read_env_var_type(parsed_ev[3])
-        ev_min = read_float_with_default(parsed_ev[5], None)
-        ev_max = read_float_with_default(parsed_ev[7], None)
-        ev_unit = read_char_string(parsed_ev[9])
-        ev_ival = read_float_with_default(parsed_ev[10], None)
-        ev_id = read_int(parsed_ev[11])
-        ev_atype = read_env_var_access_type(parsed_ev[12])
+        ev_name = parsed_ev["env_var_name"]
+        ev_type = read_env_var_type(parsed_ev["env_var_type"])
+        ev_min = read_float_with_default(parsed_ev["minimum"], None)
+        ev_max = read_float_with_default(parsed_ev["maximum"], None)
+        ev_unit = read_interned_string(parsed_ev["unit"])
+        ev_ival = read_float_with_default(parsed_ev["initial_value"], None)
+        ev_id = read_int(parsed_ev["ev_id"])
+        ev_atype = read_env_var_access_type(parsed_ev["access_type"])
         ev = DbcEnvironmentVariable(ev_name, ev_type, 0, ev_min, ev_max, ev_unit, ev_ival, ev_id, ev_atype)
-        ev_anodes = parsed_ev[13]
+        ev_anodes = parsed_ev["access_nodes"]
         for ev_anode in ev_anodes:
             if ev_anode != "Vector__XXX":
                 if dbc.has_node(ev_anode):
@@ -582,37 +1024,36 @@ class DbcFactory:
         return ev
     def _process_comments(self, ast, dbc: DbcFile) -> DbcFile:
         comments = ast["comments"]
-        for comment in comments:
-            if len(comment) == 3:
-                # Global comment
-                dbc.version = read_char_string(comment[1])
-            elif len(comment) == 5:
-                # BU_, BO_ or EV_
-                object_type = comment[1]
-                if object_type == "BU_":
-                    node_name = comment[2]
-                    node = dbc.get_node(node_name)
-                    node.description = read_char_string(comment[3])
-                elif object_type == "BO_":
-                    msg_id = read_int(comment[2])
-                    msg = dbc.get_message(msg_id)
-                    msg.description = read_char_string(comment[3])
-                elif object_type == "EV_":
-                    ev_name = comment[2]
-                    ev = dbc.get_environment_variable(ev_name)
-                    ev.description = read_char_string(comment[3])
-                else:
+        handlers = self._comment_handlers
+        for comment in consume_statements(comments):
+            length = len(comment)
+            object_type = comment[1] if length > 3 else None
+            handler = handlers.get((length, object_type))
+            if handler is None:
+                if length in (5, 6):
                     raise RuntimeError(f"Unexpected object type {object_type} in comment {comment}")
-            elif len(comment) == 6:
-                # SG_ comment
-                msg_id = read_int(comment[2])
-                msg = dbc.get_message(msg_id)
-                signal_name = comment[3]
-                signal = msg.get_signal(signal_name)
-                signal.description = read_char_string(comment[4])
-            else:
                 raise RuntimeError(f"Unexpected token length in comment {comment}")
+            handler(comment, dbc)
         return dbc
+    def _process_global_comment(self, comment, dbc: DbcFile):
+        dbc.version = read_char_string(comment[1])
+    def _process_node_comment(self, comment, dbc: DbcFile):
+        node_name = comment[2]
+        node = dbc.get_node(node_name)
+        node.description = read_char_string(comment[3])
+    def _process_message_comment(self, comment, dbc: DbcFile):
+        msg_id = read_int(comment[2])
+        msg = dbc.get_message(msg_id)
+        msg.description = read_char_string(comment[3])
+    def _process_ev_comment(self, comment, dbc: DbcFile):
+        ev_name = comment[2]
+        ev = dbc.get_environment_variable(ev_name)
+        ev.description = read_char_string(comment[3])
+    def _process_signal_comment(self, comment, dbc: DbcFile):
+        msg_id = read_int(comment[2])
+        signal_name = comment[3]
+        signal = dbc.get_message_signal(msg_id, signal_name)
+        signal.description = read_char_string(comment[4])
     def _process_nodes(self, ast, dbc: DbcFile) -> DbcFile:
         nodes = ast["nodes"]
         node_names = nodes["node_names"]
@@ -622,9 +1063,10 @@ class DbcFactory:
         return dbc
     def _process_messages(self, ast, dbc: DbcFile) -> DbcFile:
         messages = ast["messages"]
-        for message in messages:
-            frame = self.create_message(message, dbc)
-            dbc._add_message(frame)
+        create_message = self.create_message
+        add_message = dbc._add_message
+        for message in consume_statements(messages):
+            add_message(create_message(message, dbc))
         return dbc
     def _process_environment_variables(self, ast, dbc: DbcFile) -> DbcFile:
         evs = ast["environment_variables"]
@@ -647,9 +1089,8 @@ class DbcFactory:
             token = st[0]
             if token == "SIG_VALTYPE_":
                 msg_id = read_int(st[1])
-                msg = dbc.get_message(msg_id)
                 sig_name = st[2]
-                sig = msg.get_signal(sig_name)
+                sig = dbc.get_message_signal(msg_id, sig_name)
                 stype = read_extended_value_type(st[4], sig)
                 sig.value_type = stype
         return dbc
@@ -658,161 +1099,122 @@ class DbcFactory:
         for attribute_definition in attribute_definitions:
             attr_type = attribute_definition[0]
             if attr_type == "BA_DEF_" and len(attribute_definition) == 4:
-                attribute_name = attribute_definition[1].name
+                attribute_name = attribute_definition[1]
                 attribute_type = read_attribute_value_type(attribute_definition[2])
                 attr = DbcAttribute(attribute_name, attribute_type, DbcAttributeObjectType.GLOBAL)
                 dbc._add_attribute_definition(attr)
             elif len(attribute_definition) == 5:
                 object_type = attribute_definition[1]
-                attribute_name = attribute_definition[2].name
+                attribute_name = attribute_definition[2]
                 attribute_type = read_attribute_value_type(attribute_definition[3])
-                otype = DbcAttributeObjectType.GLOBAL
-                if attr_type == "BA_DEF_" and object_type == "BU_":
-                    otype = DbcAttributeObjectType.NODE
-                elif attr_type == "BA_DEF_" and object_type == "BO_":
-                    otype = DbcAttributeObjectType.MESSAGE
-                elif attr_type == "BA_DEF_" and object_type == "SG_":
-                    otype = DbcAttributeObjectType.SIGNAL
-                elif attr_type == "BA_DEF_" and object_type == "EV_":
-                    otype = DbcAttributeObjectType.ENVIRONMENT_VARIABLE
-                elif attr_type == "BA_DEF_REL_" and object_type == "BU_BO_REL_":
-                    otype = DbcAttributeObjectType.NODE_MESSAGE
-                elif attr_type == "BA_DEF_REL_" and object_type == "BU_SG_REL_":
-                    otype = DbcAttributeObjectType.NODE_SIGNAL
-                elif attr_type == "BA_DEF_REL_" and object_type == "BU_EV_REL_":
-                    otype = DbcAttributeObjectType.NODE_ENVIRONMENT_VARIABLE
-                else:
-                    raise RuntimeError(f"Unexpected object {object_type} for attribute definition")
+                otype = read_attribute_object_type(attr_type, object_type)
                 attr = DbcAttribute(attribute_name, attribute_type, otype)
                 dbc._add_attribute_definition(attr)
             else:
                 raise RuntimeError(f"Unexpected token length in attribute_definition {attribute_definition}")
         attribute_defaults = ast["attribute_defaults"]
         for attribute_default in attribute_defaults:
-            attribute_name = attribute_default[1].name
+            attribute_name = attribute_default[1]
             attr = dbc.get_attribute_definition(attribute_name)
             attribute_value = read_attribute_value(attribute_default[2], attr)
             attr.default = attribute_value
         attribute_values = ast["attribute_values"]
-        for attribute_value in attribute_values:
+        handlers = self._attribute_value_handlers
+        get_attribute_definition = dbc.get_attribute_definition
+        for attribute_value in consume_statements(attribute_values):
             attr_type = attribute_value[0]
-            if attr_type == "BA_" and len(attribute_value) == 4:
-                attr_name = attribute_value[1].name
-                attr = dbc.get_attribute_definition(attr_name)
-                attr_value = read_attribute_value(attribute_value[2], attr)
-                dbc.add_attribute_value(attr_value)
-            elif attr_type == "BA_" and  len(attribute_value) == 6:
-                attr_name = attribute_value[1].name
-                object_type = attribute_value[2]
-                attr = dbc.get_attribute_definition(attr_name)
-                attr_value = read_attribute_value(attribute_value[4], attr)
-                if attr_type == "BA_" and object_type == "BU_":
-                    node_name = attribute_value[3]
-                    node = dbc.get_node(node_name)
-                    node.add_attribute(attr_value)
-                elif attr_type == "BA_" and object_type == "BO_":
-                    msg_id = read_int(attribute_value[3])
-                    msg = dbc.get_message(msg_id)
-                    msg.add_attribute(attr_value)
-                elif attr_type == "BA_" and object_type == "EV_":
-                    ev_name = attribute_value[3]
-                    ev = dbc.get_environment_variable(ev_name)
-                    ev.add_attribute(attr_value)
-                else:
-                    raise RuntimeError(f"Unexpected object {object_type} for attribute value")
-            elif attr_type == "BA_REL_" and  len(attribute_value) == 6:
-                attr_name = attribute_value[1].name
-                object_type = attribute_value[2]
-                attr = dbc.get_attribute_definition(attr_name)
-                node_name = attribute_value[3]
-                node = dbc.get_node(node_name)
-                attr_value = read_attribute_value(attribute_value[4], attr)
-                raise NotImplementedError(f"TODO")
-            elif len(attribute_value) == 7:
-                attr_name = attribute_value[1].name
-                object_type = attribute_value[2]
-                attr = dbc.get_attribute_definition(attr_name)
-                attr_value = read_attribute_value(attribute_value[5], attr)
-                if attr_type == "BA_" and object_type == "SG_":
-                    msg_id = read_int(attribute_value[3])
-                    msg = dbc.get_message(msg_id)
-                    sig_name = attribute_value[4]
-                    sig = msg.get_signal(sig_name)
-                    sig.add_attribute(attr_value)
-                else:
-                    raise RuntimeError(f"Unexpected object {object_type} for attribute value")
-            elif attr_type == "BA_REL_" and len(attribute_value) == 8:
-                attr_name = attribute_value[1].name
-                object_type1 = attribute_value[2]
-                attr = dbc.get_attribute_definition(attr_name)
-                node_name = attribute_value[3]
-                node = dbc.get_node(node_name)
-                object_type2 = attribute_value[4]
-                attr_value = read_attribute_value(attribute_value[6], attr)
-                if object_type1 == "BU_BO_REL_" and object_type2 == "BO_":
-                    msg_id = read_int(attribute_value[5])
-                    msg = dbc.get_message(msg_id)
-                    msg.add_node_attribute(node_name, attr_value)
-                elif object_type1 == "BU_EV_REL_" and object_type2 == "EV_":
-                    ev_name = attribute_value[5]
-                    ev = dbc.get_environment_variable(ev_name)
-                    ev.add_node_attribute(node_name, attr_value)
-                else:
-                    raise RuntimeError(f"Unexpected object {object_type1} for attribute value")
-            elif attr_type == "BA_REL_" and len(attribute_value) == 9:
-                attr_name = attribute_value[1].name
-                object_type1 = attribute_value[2]
-                attr = dbc.get_attribute_definition(attr_name)
-                node_name = attribute_value[3]
-                object_type2 = attribute_value[4]
-                attr_value = read_attribute_value(attribute_value[7], attr)
-                if object_type1 == "BU_SG_REL_" and object_type2 == "SG_":
-                    msg_id = read_int(attribute_value[5])
-                    msg = dbc.get_message(msg_id)
-                    sig_name = attribute_value[6]
-                    sig = msg.get_signal(sig_name)
-                    sig.add_node_attribute(node_name, attr_value)
-                else:
-                    raise RuntimeError(f"Unexpected object {object_type1} for attribute value")
-            else:
-                raise RuntimeError(f"Unexpected token length in attribute_value {attribute_value}")
+            length = len(attribute_value)
+            object_type = attribute_value[2] if length > 4 else None
+            handler = handlers.get((attr_type, length, object_type))
+            if handler is None:
+                raise RuntimeError(f"Unexpected attribute_value {attribute_value}")
+            attr_name = attribute_value[1]
+            attr = get_attribute_definition(attr_name)
+            handler(attribute_value, dbc, attr)
         return dbc
+    def _process_global_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        attr_value = read_attribute_value(attribute_value[2], attr)
+        dbc.add_attribute_value(attr_value)
+    def _process_node_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        node_name = attribute_value[3]
+        node = dbc.get_node(node_name)
+        node.add_parsed_attribute(attr, attribute_value[4])
+    def _process_message_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        msg_id = read_int(attribute_value[3])
+        msg = dbc.get_message(msg_id)
+        msg.add_parsed_attribute(attr, attribute_value[4])
+    def _process_ev_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        ev_name = attribute_value[3]
+        ev = dbc.get_environment_variable(ev_name)
+        ev.add_parsed_attribute(attr, attribute_value[4])
+    def _process_signal_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        msg_id = read_int(attribute_value[3])
+        sig_name = attribute_value[4]
+        sig = dbc.get_message_signal(msg_id, sig_name)
+        sig.add_parsed_attribute(attr, attribute_value[5])
+    def _process_node_rel_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        node_name = attribute_value[3]
+        node = dbc.get_node(node_name)
+        attr_value = read_attribute_value(attribute_value[4], attr)
+        raise NotImplementedError(f"TODO")
+    def _process_node_message_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        node_name = attribute_value[3]
+        node = dbc.get_node(node_name)
+        object_type = attribute_value[4]
+        if object_type != "BO_":
+            raise RuntimeError(f"Unexpected object {object_type} for attribute value")
+        attr_value = read_attribute_value(attribute_value[6], attr)
+        msg_id = read_int(attribute_value[5])
+        msg = dbc.get_message(msg_id)
+        msg.add_node_attribute(node_name, attr_value)
+    def _process_node_ev_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        node_name = attribute_value[3]
+        node = dbc.get_node(node_name)
+        object_type = attribute_value[4]
+        if object_type != "EV_":
+            raise RuntimeError(f"Unexpected object {object_type} for attribute value")
+        attr_value = read_attribute_value(attribute_value[6], attr)
+        ev_name = attribute_value[5]
+        ev = dbc.get_environment_variable(ev_name)
+        ev.add_node_attribute(node_name, attr_value)
+    def _process_node_signal_attribute_value(self, attribute_value, dbc: DbcFile, attr: DbcAttribute):
+        node_name = attribute_value[3]
+        object_type = attribute_value[4]
+        if object_type != "SG_":
+            raise RuntimeError(f"Unexpected object {object_type} for attribute value")
+        attr_value = read_attribute_value(attribute_value[7], attr)
+        msg_id = read_int(attribute_value[5])
+        sig_name = attribute_value[6]
+        sig = dbc.get_message_signal(msg_id, sig_name)
+        sig.add_node_attribute(node_name, attr_value)
     def _process_value_descriptions(self, ast, dbc: DbcFile) -> DbcFile:
         value_descriptions = ast["value_descriptions"]
-        for value_description in value_descriptions:
+        # Descriptions of one message are usually consecutive, reuse its lookup
+        last_msg_token = None
+        msg = None
+        for value_description in consume_statements(value_descriptions):
             if len(value_description) == 5:
-                msg_id = read_int(value_description[1])
-                msg = dbc.get_message(msg_id)
-                sig_name = value_description[2]
+                _, msg_token, sig_name, values, _ = value_description
+                if msg_token != last_msg_token:
+                    last_msg_token = msg_token
+                    msg = dbc.get_message(read_int(msg_token))
                 sig = msg.get_signal(sig_name)
-                values = value_description[3]
-                for value in values:
-                    val = float(value[0])
-                    label = read_char_string(value[1])
-                    sig.add_value_description(val, label)
+                sig.add_value_descriptions(read_value_descriptions(values))
             elif len(value_description) == 4:
-                ev_name = value_description[1]
+                _, ev_name, values, _ = value_description
                 ev = dbc.get_environment_variable(ev_name)
-                values = value_description[2]
-                for value in values:
-                    val = float(value[0])
-                    label = read_char_string(value[1])
-                    ev.add_value_description(val, label)
+                ev.add_value_descriptions(read_value_descriptions(values))
             else:
                 raise RuntimeError(f"Unexpected token length in value_description {value_description}")
         return dbc
     def _process_signal_groups(self, ast, dbc: DbcFile) -> DbcFile:
         signal_groups = ast["signal_groups"]
         for signal_group in signal_groups:
-            msg_id = read_int(signal_group[1])
-            msg = dbc.get_message(msg_id)
-            sig_gp_name = signal_group[2]
-            repetitions = read_int(signal_group[3])
-            sig_gp = DbcSignalGroup(sig_gp_name, repetitions)
-            signal_names = signal_group[5]
-            for signal_name in signal_names:
-                sig = msg.get_signal(signal_name)
-                sig_gp._add_signal(sig)
+            _, msg_id, sig_gp_name, repetitions, _, signal_names, _ = signal_group
+            msg = dbc.get_message(read_int(msg_id))
+            sig_gp = DbcSignalGroup(sig_gp_name, read_int(repetitions))
+            get_signal = msg.get_signal
+            sig_gp.signals = [get_signal(signal_name) for signal_name in signal_names]
             msg._add_signal_group(sig_gp)
         return dbc
     def _process_version(self, ast, dbc: DbcFile) -> DbcFile:
@@ -824,57 +1226,130 @@ class DbcFactory:
     def _process_value_tables(self, ast, dbc: DbcFile) -> DbcFile:
         vtables = ast["value_tables"]
         for vtable in vtables:
-            name = vtable[1]
+            _, name, values, _ = vtable
             vt = DbcValueTable(name)
-            values = vtable[2]
-            for value in values:
-                val = read_float(value[0])
-                label = read_char_string(value[1])
-                vt._add_value(val, label)
+            vt.values = [(label, val) for val, label in read_value_descriptions(values)]
             dbc._add_value_table(vt)
         return dbc
     def create_dbc(self, model, text: str) -> DbcFile:
         dbc = DbcFile()
         ast = model.parse(text)
-        dbc = self._process_version(ast, dbc)
-        dbc = self._process_nodes(ast, dbc)
-        dbc = self._process_value_tables(ast, dbc)
-        dbc = self._process_messages(ast, dbc)
-        dbc = self._process_environment_variables(ast, dbc)
-        dbc = self._process_environment_variables_data(ast, dbc)
-        dbc = self._process_comments(ast, dbc)
-        dbc = self._process_attributes(ast, dbc)
-        dbc = self._process_value_descriptions(ast, dbc)
-        dbc = self._process_signal_type_refs(ast, dbc)
-        dbc = self._process_signal_groups(ast, dbc)
+        for process in self._passes:
+            dbc = process(ast, dbc)
         return dbc
 
-def parse_dbc(filename: str) -> DbcFile:
+def parse_dbc(filename: str, strict: bool = False) -> DbcFile:
     dbc = Path(filename)
     if not dbc.exists():
         raise RuntimeError(f"Wrong DBC path {dbc}")
-    with dbc.open('r') as infile:
-        text = infile.read()
-    return parse_text(text)
+    text = read_dbc_text(dbc)
+    return parse_text(text, strict)
 
-def parse_text(text: str) -> DbcFile:
-    global __grammar_model
-    factory = DbcFactory()
-    if __grammar_model is None:
-        grammar_file = Path(__file__).resolve().parent / 'grammar.ebnf'
-        if not grammar_file.exists():
-            raise RuntimeError(f"Wrong grammar file {grammar_file}")
-        grammar = grammar_file.read_text()
+def parse_many(filenames: List[str], strict: bool = False, max_workers: Optional[int] = None) -> Dict[str, DbcFile]:
+    # Parsing is pure Python and holds the GIL, spread the files over processes
+    initializer = get_grammar_model if strict else None
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer) as executor:
+        dbcs = executor.map(parse_dbc, filenames, [strict] * len(filenames))
+        return dict(zip(filenames, dbcs))
+
+MMAP_THRESHOLD = 1 << 20
+
+def read_dbc_text(dbc: Path) -> str:
+    encoding = locale.getpreferredencoding(False)
+    with dbc.open('rb') as infile:
+        if os.fstat(infile.fileno()).st_size < MMAP_THRESHOLD:
+            text = infile.read().decode(encoding)
+        else:
+            # Decode straight from the mapped pages, without an intermediate bytes copy
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, encoding)
+    if "\r" in text:
+        # Same newline handling as reading in text mode
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def get_grammar_cache_dir() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return Path(cache_home) / 'dbc_parser'
+    return Path.home() / '.cache' / 'dbc_parser'
+
+def compile_grammar(grammar: str):
+    # tatsu is only needed for strict parsing, import it on demand
+    from tatsu import compile as tatsu_compile
+    from tatsu import __version__ as tatsu_version
+    # Compiled models are pickled per grammar and tatsu version
+    digest = hashlib.sha256(f"{tatsu_version}\n{grammar}".encode()).hexdigest()[:16]
+    cache_file = get_grammar_cache_dir() / f'grammar-{digest}.pkl'
+    try:
+        with cache_file.open('rb') as infile:
+            model = pickle.load(infile)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        # Missing or unreadable cache, compile it again
         model = tatsu_compile(grammar)
-        __grammar_model = model
-    dbc = factory.create_dbc(__grammar_model, text)
-    return dbc
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with cache_file.open('wb') as outfile:
+                pickle.dump(model, outfile)
+        except OSError:
+            pass
+    model.config = model.config.replace(**TATSU_SETTINGS)
+    return model
+
+def grammar_digest(grammar: str) -> str:
+    return hashlib.sha256(grammar.encode()).hexdigest()
+
+def load_generated_parser():
+    try:
+        # Parser generated at build time by build_grammar.py
+        import dbc_grammar
+    except ImportError:
+        return None
+    try:
+        grammar = GRAMMAR_FILE.read_text()
+    except OSError:
+        # Installed without the grammar, nothing to compare against
+        return dbc_grammar.DBCParser(**TATSU_SETTINGS)
+    if getattr(dbc_grammar, "GRAMMAR_DIGEST", None) != grammar_digest(grammar):
+        # grammar.ebnf was edited after dbc_grammar.py was generated
+        return None
+    return dbc_grammar.DBCParser(**TATSU_SETTINGS)
+
+def get_grammar_model():
+    global __grammar_model, __grammar_key
+    if __grammar_model is None:
+        __grammar_model = load_generated_parser()
+        if __grammar_model is not None:
+            return __grammar_model
+    elif __grammar_key is None:
+        return __grammar_model
+    try:
+        key = (GRAMMAR_FILE, GRAMMAR_FILE.stat().st_mtime_ns)
+    except OSError:
+        raise RuntimeError(f"Wrong grammar file {GRAMMAR_FILE}")
+    # Recompile only when grammar.ebnf has been edited since the last call
+    if key != __grammar_key:
+        __grammar_model = compile_grammar(GRAMMAR_FILE.read_text())
+        __grammar_key = key
+    return __grammar_model
+
+def parse_text(text: str, strict: bool = False) -> DbcFile:
+    factory = DbcFactory()
+    if strict:
+        # Validate the whole file against grammar.ebnf
+        return factory.create_dbc(get_grammar_model(), text)
+    try:
+        return factory.create_dbc(DbcScanner(), text)
+    except DbcUnknownKeywordError:
+        # Let the grammar decide on statements the scanner does not know
+        return DbcFactory().create_dbc(get_grammar_model(), text)
 
-def main(dbc: str):
-    parse_dbc(dbc)
+def main(dbc: str, strict: bool):
+    parse_dbc(dbc, strict)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description = '')
     parser.add_argument('dbc', help='Input DBC')
+    parser.add_argument('--strict', action='store_true', help='Parse with the tatsu grammar instead of the line scanner')
     args = parser.parse_args()
-    main(args.dbc)
\ No newline at end of file
+    main(args.dbc, args.strict)
@@ -0,0 +1,35 @@
+import os
+import shutil
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+class BuildPyWithGrammar(build_py):
+    def run(self):
+        # dbc_grammar.py is checked in, only regenerate it when grammar.ebnf is newer
+        if not os.path.exists("dbc_grammar.py") or os.path.getmtime("grammar.ebnf") > os.path.getmtime("dbc_grammar.py"):
+            from build_grammar import build_grammar
+            build_grammar()
+        super().run()
+        # parser_tatsu falls back to compiling grammar.ebnf next to it
+        if not self.dry_run:
+            shutil.copy("grammar.ebnf", os.path.join(self.build_lib, "grammar.ebnf"))
+
+# Set DBC_PARSER_CYTHON=0 to force a pure-Python install
+ext_modules = []
+if os.environ.get("DBC_PARSER_CYTHON", "1") != "0":
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        pass
+    else:
+        ext_modules = cythonize("parser_tatsu.py", language_level=3)
+
+setup(
+    name="dbc_parser",
+    version="0.1.0",
+    description="Parser for DBC files based on a EBNF file",
+    py_modules=["parser_tatsu", "dbc_grammar"],
+    ext_modules=ext_modules,
+    install_requires=["tatsu"],
+    cmdclass={"build_py": BuildPyWithGrammar},
+)
@@ -1,15 +1,19 @@
 import pytest
 
-from parser_tatsu import DbcFactory, DbcMessage, DbcSignal, parse_dbc, parse_text, DbcSignalByteOrder, DbcSignalValueType, DbcEnvironmentVariableType, DbcEnvironmentVariableAccessType, DbcAttributeObjectType, DbcAttributeType, read_char_string
+from parser_tatsu import DbcFactory, DbcScanner, DbcSignalLayout, DbcUnknownKeywordError, GRAMMAR_FILE, compile_grammar, get_grammar_cache_dir, get_grammar_model, grammar_digest, DbcMessage, DbcSignal, parse_dbc, parse_many, parse_text, DbcSignalByteOrder, DbcSignalValueType, DbcEnvironmentVariableType, DbcEnvironmentVariableAccessType, DbcAttributeObjectType, DbcAttributeType, read_char_string, read_interned_string
 
 class Setup:
     def __init__(self):
         self.factory = DbcFactory()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def setup() -> Setup:
     return Setup()
 
+@pytest.fixture(autouse=True)
+def grammar_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
 def test_version(setup: Setup):
     text = r'''
 VERSION "TEST"
@@ -103,6 +107,60 @@ BU_:
     dbc = parse_text(text)
     assert dbc.version == "TEST"
 
+def test_ns_blank_line(setup: Setup):
+    text = r'''
+VERSION "TEST"
+
+NS_ :
+
+	NS_DESC_
+	CM_
+
+	BA_DEF_
+BS_:
+
+BU_: NODE1
+'''
+    for strict in (False, True):
+        dbc = parse_text(text, strict)
+        assert dbc.version == "TEST"
+        assert dbc.has_node("NODE1")
+
+def test_tab_separated(setup: Setup):
+    text = (
+        "VERSION\t\"TEST\"\n\n"
+        "BS_:\n\n"
+        "BU_:\tNODE1\tNODE2\n\n"
+        "BO_\t123\tMESSAGE1:\t8\tNODE1\n"
+        "\tSG_\tSIGNAL11\t:\t0|8@1+\t(1,0)\t[0|10]\t\"\"\tNODE2\n\n"
+        "CM_\tBU_\tNODE1\t\"DESCRIPTION\";\n"
+    )
+    ast = DbcScanner().parse(text)
+    assert len(ast["messages"][0]["signals"]) == 1
+    for strict in (False, True):
+        dbc = parse_text(text, strict)
+        assert dbc.version == "TEST"
+        assert dbc.get_node("NODE1").description == "DESCRIPTION"
+        assert dbc.get_message(123).get_signal("SIGNAL11").receivers[0].name == "NODE2"
+
+def test_signal_outside_message(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 0|8@1+ (1,0) [0|10] ""  NODE2
+
+CM_ BO_ 123 "Message 1";
+ SG_ SIGNAL12 : 8|8@1+ (1,0) [0|10] ""  NODE2
+'''
+    with pytest.raises(RuntimeError, match="SIGNAL12 outside of a message"):
+        DbcScanner().parse(text)
+    for strict in (False, True):
+        with pytest.raises(Exception):
+            parse_text(text, strict)
+
 def test_node(setup: Setup):
     text = r'''
 BS_:
@@ -304,6 +362,62 @@ BO_ 123 MESSAGE1: 8 NODE1
     assert sig.receivers[0].name == "NODE2"
     assert sig.receivers[1].name == "NODE3"
 
+def test_signal_multiplexer(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 M : 0|8@0- (0.5,-1) [-1|126.5] "V" NODE2
+'''
+    for strict in (False, True):
+        dbc = parse_text(text, strict)
+        sig = dbc.get_message(123).get_signal("SIGNAL11")
+        assert sig.byte_order == DbcSignalByteOrder.LITTLE_ENDIAN
+        assert sig.value_type == DbcSignalValueType.SIGNED
+        assert sig.factor == 0.5
+        assert sig.offset == -1
+        assert sig.maximum == 126.5
+        assert sig.unit == "V"
+        assert [node.name for node in sig.receivers] == ["NODE2"]
+
+def test_unknown_keyword_fallback(setup: Setup, monkeypatch):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+
+BO_TX_BU_ 123 : NODE1,NODE2;
+'''
+    monkeypatch.setattr(DbcScanner, "IGNORED_KEYWORDS", DbcScanner.IGNORED_KEYWORDS - {"BO_TX_BU_"})
+    models = []
+    def get_model():
+        models.append(get_grammar_model())
+        return models[-1]
+    monkeypatch.setattr("parser_tatsu.get_grammar_model", get_model)
+    with pytest.raises(DbcUnknownKeywordError):
+        DbcScanner().parse(text)
+    dbc = parse_text(text)
+    assert len(models) == 1
+    assert dbc.get_message(123).name == "MESSAGE1"
+
+def test_scanner_error_not_swallowed(setup: Setup, monkeypatch):
+    text = r'''
+BS_:
+
+BU_: NODE1
+
+CM_ BU_ NODE1 "DESCRIPTION"
+'''
+    models = []
+    monkeypatch.setattr("parser_tatsu.get_grammar_model", lambda: models.append(None))
+    with pytest.raises(RuntimeError, match="Unterminated statement"):
+        parse_text(text)
+    assert models == []
+
 def test_signal_value_description(setup: Setup):
     text = r'''
 BS_:
@@ -325,6 +439,30 @@ VAL_ 123 SIGNAL11 1 "LABEL1" 2 "LABEL2" ;
     assert sig.value_descriptions[1][0] == 2
     assert sig.value_descriptions[1][1] == "LABEL2"
 
+def test_signal_value_label(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 18|2@1+ (1,0) [0|10] ""  NODE2
+
+VAL_ 123 SIGNAL11 1 "LABEL1" 2 "LABEL2" ;
+'''
+    dbc = parse_text(text)
+    sig = dbc.get_message(123).get_signal("SIGNAL11")
+    assert sig.get_value_label(2) == "LABEL2"
+    sig.add_value_description(3, "LABEL3")
+    assert sig.get_value_label(3) == "LABEL3"
+    with pytest.raises(KeyError):
+        sig.get_value_label(4)
+    value_descriptions = sig.value_descriptions
+    sig.add_value_description(4, "LABEL4")
+    assert sig.get_value_label(4) == "LABEL4"
+    assert sig.value_descriptions is value_descriptions
+    assert sig.value_descriptions == [(1, "LABEL1"), (2, "LABEL2"), (3, "LABEL3"), (4, "LABEL4")]
+
 def test_signal_extended_type(setup: Setup):
     text = r'''
 BS_:
@@ -615,4 +753,279 @@ BA_REL_ "ATTR" BU_SG_REL_ NODE1 SG_ 123 SIGNAL11 3000;
     assert "NODE1" in attrs
     attr1 = attrs["NODE1"]
     assert attr1.name == "ATTR"
-    assert attr1.value == 3000
\ No newline at end of file
+    assert attr1.value == 3000
+
+def test_attribute_node(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BA_DEF_ BU_  "ATTR" INT 0 0;
+BA_DEF_DEF_  "ATTR" 0;
+BA_ "ATTR" BU_ NODE1 2660;
+'''
+    dbc = parse_text(text)
+    node = dbc.get_node("NODE1")
+    assert node.has_attribute("ATTR")
+    attr = node.get_attribute("ATTR")
+    assert attr.value == 2660
+    assert attr.attribute.object_type == DbcAttributeObjectType.NODE
+    assert not dbc.get_node("NODE2").has_attribute("ATTR")
+
+def test_attribute_node_message(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+
+BA_DEF_REL_ BU_BO_REL_  "ATTR" INT 0 65535;
+BA_DEF_DEF_REL_ "ATTR" 0;
+BA_REL_ "ATTR" BU_BO_REL_ NODE2 BO_ 123 3000;
+'''
+    dbc = parse_text(text)
+    msg = dbc.get_message(123)
+    assert msg.has_node_attribute("ATTR")
+    attrs = msg.get_node_attribute("ATTR")
+    assert attrs["NODE2"].value == 3000
+    assert attrs["NODE2"].attribute.object_type == DbcAttributeObjectType.NODE_MESSAGE
+
+def test_comment_multiline(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1
+
+CM_ BU_ NODE1 "Node 1
+spans; lines";
+'''
+    dbc = parse_text(text)
+    node = dbc.get_node("NODE1")
+    assert node.description == "Node 1\nspans; lines"
+
+def test_comment_not_interned(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1
+
+CM_ BU_ NODE1 "DESCRIPTION";
+'''
+    read_interned_string.cache_clear()
+    dbc = parse_text(text)
+    assert dbc.get_node("NODE1").description == "DESCRIPTION"
+    assert read_interned_string.cache_info().currsize == 0
+
+def test_strict(setup: Setup):
+    text = r'''
+VERSION "TEST"
+
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 18|2@1+ (0.5,-1.5) [0|10] "UNIT"  NODE2
+
+BA_DEF_ SG_  "ATTR" INT 0 0;
+BA_DEF_DEF_  "ATTR" 0;
+BA_ "ATTR" SG_ 123 SIGNAL11 2660;
+VAL_ 123 SIGNAL11 1 "LABEL1" 2 "LABEL2" ;
+'''
+    dbc = parse_text(text, strict=True)
+    assert dbc.version == "TEST"
+    sig = dbc.get_message(123).get_signal("SIGNAL11")
+    assert sig.factor == 0.5
+    assert sig.offset == -1.5
+    assert sig.unit == "UNIT"
+    assert sig.get_attribute("ATTR").value == 2660
+    assert sig.value_descriptions == [(1, "LABEL1"), (2, "LABEL2")]
+
+def test_attribute_enum_shared(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1
+
+BO_ 123 MESSAGE1: 8 NODE1
+
+BO_ 124 MESSAGE2: 8 NODE1
+
+BA_DEF_ BO_  "ATTR" ENUM  "Cyclic","NotUsed";
+BA_DEF_DEF_  "ATTR" "Cyclic";
+BA_ "ATTR" BO_ 123 "NotUsed";
+BA_ "ATTR" BO_ 124 "NotUsed";
+'''
+    dbc = parse_text(text)
+    attr1 = dbc.get_message(123).get_attribute("ATTR")
+    attr2 = dbc.get_message(124).get_attribute("ATTR")
+    assert attr1.value == "NotUsed"
+    assert attr1.attribute.value_type.is_enum()
+    assert attr1.attribute.value_type.labels == ["Cyclic", "NotUsed"]
+    assert attr1 is attr2
+
+def test_attribute_message_conflict(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1
+
+BO_ 123 MESSAGE1: 8 NODE1
+
+BA_DEF_ BO_  "ATTR" INT 0 0;
+BA_DEF_DEF_  "ATTR" 0;
+BA_ "ATTR" BO_ 123 1;
+BA_ "ATTR" BO_ 123 2;
+'''
+    with pytest.raises(RuntimeError):
+        parse_text(text)
+
+def test_attribute_resolve_default(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1
+
+BO_ 123 MESSAGE1: 8 NODE1
+
+BO_ 124 MESSAGE2: 8 NODE1
+
+BA_DEF_ BO_  "ATTR" INT 0 10;
+BA_DEF_DEF_  "ATTR" 3;
+BA_ "ATTR" BO_ 123 5;
+'''
+    dbc = parse_text(text)
+    msg1 = dbc.get_message(123)
+    msg2 = dbc.get_message(124)
+    assert dbc.resolve_attribute(msg1, "ATTR").value == 5
+    assert not msg2.has_attribute("ATTR")
+    attr = dbc.resolve_attribute(msg2, "ATTR")
+    assert attr is dbc.get_attribute_definition("ATTR").default
+    assert attr.value == 3
+
+def test_signal_layout(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 0|8@1+ (1,0) [0|10] ""  NODE2
+ SG_ SIGNAL12 : 8|16@0- (0.5,-10) [0|10] ""  NODE2
+'''
+    dbc = parse_text(text)
+    layout = dbc.get_message(123).get_signal_layout()
+    assert len(layout) == 2
+    assert list(layout.start_bits) == [0, 8]
+    assert list(layout.sizes) == [8, 16]
+    assert list(layout.byte_orders) == [DbcSignalByteOrder.BIG_ENDIAN.value, DbcSignalByteOrder.LITTLE_ENDIAN.value]
+    assert list(layout.factors) == [1.0, 0.5]
+    assert list(layout.offsets) == [0.0, -10.0]
+    signals = dbc.get_message(123).signals_by_name.values()
+    layout = DbcSignalLayout((signal for signal in signals), 123)
+    assert list(layout.message_ids) == [123, 123]
+    assert list(layout.sizes) == [8, 16]
+
+def test_file_signal_layout(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 0|8@1+ (1,0) [0|10] ""  NODE2
+
+BO_ 124 MESSAGE2: 8 NODE1
+ SG_ SIGNAL21 : 4|4@1+ (1,0) [0|10] ""  NODE2
+ SG_ SIGNAL22 : 8|16@0- (0.5,-10) [0|10] ""  NODE2
+'''
+    dbc = parse_text(text)
+    layout = dbc.get_signal_layout()
+    assert len(layout) == 3
+    assert list(layout.message_ids) == [123, 124, 124]
+    assert list(layout.start_bits) == [0, 4, 8]
+    assert list(layout.factors) == [1.0, 1.0, 0.5]
+
+def test_message_get_signals(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 18|2@1+ (1,0) [0|0] ""  NODE2
+ SG_ SIGNAL12 : 20|2@1+ (1,0) [0|0] ""  NODE2
+'''
+    dbc = parse_text(text)
+    msg = dbc.get_message(123)
+    assert [sig.name for sig in msg.get_signals()] == ["SIGNAL11", "SIGNAL12"]
+    signals = msg.get_signals_tuple()
+    assert signals[1].name == "SIGNAL12"
+    assert msg.get_signals_tuple() is signals
+
+def test_file_get_message_signal(setup: Setup):
+    text = r'''
+BS_:
+
+BU_: NODE1 NODE2
+
+BO_ 123 MESSAGE1: 8 NODE1
+ SG_ SIGNAL11 : 0|8@1+ (1,0) [0|10] ""  NODE2
+
+BO_ 124 MESSAGE2: 8 NODE1
+ SG_ SIGNAL11 : 8|8@1+ (1,0) [0|10] ""  NODE2
+'''
+    dbc = parse_text(text)
+    assert dbc.get_message_signal(123, "SIGNAL11") is dbc.get_message(123).get_signal("SIGNAL11")
+    assert dbc.get_message_signal(124, "SIGNAL11").start_bit == 8
+    with pytest.raises(KeyError):
+        dbc.get_message_signal(123, "SIGNAL12")
+
+def test_parse_dbc_mmap(setup: Setup, tmp_path, monkeypatch):
+    text = 'VERSION "TEST"\r\n\r\nBS_:\r\n\r\nBU_: NODE1\r\n\r\nCM_ BU_ NODE1 "LINE1\r\nLINE2";\r\n'
+    path = tmp_path / "test.dbc"
+    path.write_bytes(text.encode())
+    for threshold in (1 << 20, 0):
+        monkeypatch.setattr("parser_tatsu.MMAP_THRESHOLD", threshold)
+        dbc = parse_dbc(str(path))
+        assert dbc.version == "TEST"
+        assert dbc.get_node("NODE1").description == "LINE1\nLINE2"
+
+def test_parse_many(setup: Setup, tmp_path):
+    filenames = []
+    for i in range(3):
+        path = tmp_path / f"test{i}.dbc"
+        path.write_text(f'VERSION "TEST{i}"\n\nBS_:\n\nBU_: NODE{i}\n')
+        filenames.append(str(path))
+    dbcs = parse_many(filenames, max_workers=2)
+    assert list(dbcs) == filenames
+    for i, filename in enumerate(filenames):
+        assert dbcs[filename].version == f"TEST{i}"
+        assert dbcs[filename].has_node(f"NODE{i}")
+
+def test_generated_parser_in_sync(setup: Setup):
+    import dbc_grammar
+    assert dbc_grammar.GRAMMAR_DIGEST == grammar_digest(GRAMMAR_FILE.read_text())
+
+def test_generated_parser_stale(setup: Setup, monkeypatch):
+    import dbc_grammar
+    monkeypatch.setattr(dbc_grammar, "GRAMMAR_DIGEST", "stale")
+    monkeypatch.setattr("parser_tatsu.__grammar_model", None)
+    monkeypatch.setattr("parser_tatsu.__grammar_key", None)
+    model = get_grammar_model()
+    assert not isinstance(model, dbc_grammar.DBCParser)
+    dbc = parse_text("BS_:\n\nBU_: NODE1\n", strict=True)
+    assert dbc.has_node("NODE1")
+
+def test_grammar_cache(setup: Setup, monkeypatch):
+    grammar = GRAMMAR_FILE.read_text()
+    compile_grammar(grammar)
+    assert len(list(get_grammar_cache_dir().glob("grammar-*.pkl"))) == 1
+    def fail_compile(*args, **kwargs):
+        raise AssertionError("grammar compiled again")
+    monkeypatch.setattr("tatsu.compile", fail_compile)
+    model = compile_grammar(grammar)
+    ast = model.parse("BS_:\n\nBU_: NODE1\n")
+    assert ast is not None